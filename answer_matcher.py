@@ -0,0 +1,122 @@
+import re
+import numpy as np
+from utils.config import MobileConfig
+
+GRAM_TABLE_SIZE = 1 << 16
+
+def normalize_for_grams(text):
+    return ' ' + re.sub(r'\s+', ' ', text.lower()).strip() + ' '
+
+
+def gram_ids(text):
+    """Hashed character trigram ids for every position of the text"""
+    codes = np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32).astype(np.uint64)
+    if len(codes) < 3:
+        return np.zeros(0, dtype=np.uint64)
+    hashed = (codes[:-2] * np.uint64(1000003)) ^ (codes[1:-1] * np.uint64(8191)) ^ codes[2:]
+    return hashed & np.uint64(GRAM_TABLE_SIZE - 1)
+
+
+class OptionScorer:
+    """Approximate option matching that tolerates OCR errors.
+
+    Each option becomes a set of hashed character trigrams. A page region
+    is hashed once, and for every option a sliding window as long as the
+    option is scored by the share of its trigrams found in that option,
+    using cumulative sums so each option costs one vectorized pass.
+    """
+
+    def __init__(self, options):
+        self.options = []
+        for option, option_text in options.items():
+            normalized = normalize_for_grams(option_text)
+            ids = gram_ids(normalized)
+            if len(ids) == 0 or not option_text.strip():
+                continue
+            present = np.zeros(GRAM_TABLE_SIZE, dtype=bool)
+            present[ids] = True
+            self.options.append((option, present, len(ids)))
+
+    def score_options(self, text):
+        """Return {option: best window similarity in 0-1} for the text"""
+        ids = gram_ids(normalize_for_grams(text))
+        scores = {}
+        for option, present, length in self.options:
+            if len(ids) == 0:
+                scores[option] = 0.0
+                continue
+            hits = present[ids]
+            if len(hits) <= length:
+                scores[option] = float(hits.sum()) / length
+                continue
+            cumulative = np.concatenate(([0], np.cumsum(hits, dtype=np.int32)))
+            window_hits = cumulative[length:] - cumulative[:-length]
+            scores[option] = float(window_hits.max()) / length
+        return scores
+
+
+class AnswerMatcher:
+    """Finds answer votes for one question in a single pass over a page.
+
+    All answer cues ("Answer: B", "B) ... correct") are compiled into one
+    alternation when the matcher is built, so each page is scanned once
+    regardless of how many options there are. Option texts are matched
+    approximately near the question. When the question appears on the
+    page, only matches near it are counted.
+    """
+
+    def __init__(self, question, options):
+        self.question_keywords = ' '.join(question.lower().split()[:10])  # First 10 words
+        self.letters = {option.lower(): option for option in options}
+        self.option_scorer = OptionScorer(options)
+
+        letters = '|'.join(re.escape(letter) for letter in sorted(self.letters, key=len, reverse=True))
+        marker = rf'\b(?:{letters})[\.\)]\s'
+        parts = [
+            # "answer: b", "correct answer is (b)", "ans - b", "answer c."; a bare letter needs a delimiter
+            # before it or must end the sentence, so "answer a few", "humans a", "not correct: a" do not vote
+            rf'(?<!not )\b(?:answer|ans|correct(?:\s+answer)?)\b'
+            rf'(?:\s*(?:is\s*)?[:\-]\s*\(?|\s+is\s+\(?|\s*\(|\s+(?=(?:{letters})\s*(?:[\.\)!\n]|$)))'
+            rf'(?P<cue>{letters})\b',
+            # "b) ... correct" on the same line with no other option marker in between, bounded to
+            # avoid backtracking over the page; a following "correct answer: c" is left to the cue
+            rf'\b(?P<mark>{letters})[\.\)]\s+(?:(?!{marker})[^\n]){{0,80}}?(?<!not )\bcorrect\b'
+            rf'(?!\s*(?:answer|ans)\b|\s*(?:is\s*)?[:\-])',
+        ]
+        self.pattern = re.compile('|'.join(parts))
+
+    def question_windows(self, content_lower):
+        """Character ranges around each occurrence of the question"""
+        windows = []
+        if not self.question_keywords:
+            return windows
+
+        before = MobileConfig.ANSWER_WINDOW_BEFORE
+        after = MobileConfig.ANSWER_WINDOW_AFTER
+        start = content_lower.find(self.question_keywords)
+        while start != -1:
+            windows.append((start - before, start + len(self.question_keywords) + after))
+            start = content_lower.find(self.question_keywords, start + 1)
+        return windows
+
+    def find_answers(self, content):
+        """Return option letters voted for by this page, one entry per vote"""
+        content_lower = content.lower()
+        windows = self.question_windows(content_lower)
+
+        found_answers = []
+        for match in self.pattern.finditer(content_lower):
+            position = match.start()
+            if windows and not any(start <= position <= end for start, end in windows):
+                continue
+            kind = match.lastgroup
+            found_answers.append(self.letters[match.group(kind)])
+
+        # Option text only counts next to the question, once per option
+        if windows:
+            region = ' '.join(content_lower[max(0, start):end] for start, end in windows)
+            for option, score in self.option_scorer.score_options(region).items():
+                if score >= MobileConfig.OPTION_MATCH_THRESHOLD:
+                    found_answers.append(option)
+
+        return found_answers
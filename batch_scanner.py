@@ -0,0 +1,221 @@
+"""Headless batch scanning of MCQ images.
+
+Runs images from a directory, a zip archive or a tar stream on stdin
+through OCR and answer search without the Kivy UI, writing one JSON
+result per image with answers keyed by question number:
+
+    python batch_scanner.py worksheets/ --output results.jsonl
+    python batch_scanner.py scans.zip
+    tar c worksheets | python batch_scanner.py -
+"""
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import tarfile
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, FIRST_COMPLETED, wait
+from utils.logger import app_logger
+from utils.config import MobileConfig
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp', '.webp', '.tif', '.tiff')
+
+def is_image_name(name):
+    return name.lower().endswith(IMAGE_EXTENSIONS)
+
+
+def iter_images(source):
+    """Yield (name, encoded image bytes) from a directory, zip file or '-' for a tar stream on stdin"""
+    if source == '-':
+        # Streaming mode: entries are read in order without seeking
+        with tarfile.open(fileobj=sys.stdin.buffer, mode='r|*') as archive:
+            for member in archive:
+                if member.isfile() and is_image_name(member.name):
+                    yield member.name, archive.extractfile(member).read()
+    elif os.path.isdir(source):
+        for root, dirs, files in os.walk(source):
+            dirs.sort()
+            for filename in sorted(files):
+                if is_image_name(filename):
+                    path = os.path.join(root, filename)
+                    with open(path, 'rb') as f:
+                        yield os.path.relpath(path, source), f.read()
+    elif zipfile.is_zipfile(source):
+        with zipfile.ZipFile(source) as archive:
+            for info in archive.infolist():
+                if not info.is_dir() and is_image_name(info.filename):
+                    yield info.filename, archive.read(info)
+    else:
+        raise ValueError(f"Unsupported batch source: {source}")
+
+
+# Per-process OCR state, created once by the pool initializer
+_text_processor = None
+_quality_gate = None
+
+def init_ocr_worker(log_level):
+    global _text_processor, _quality_gate
+    from text_processor import TextProcessor
+    from frame_filters import FrameQualityGate
+
+    app_logger.set_level(log_level)
+    _text_processor = TextProcessor()
+    if MobileConfig.QUALITY_GATE:
+        _quality_gate = FrameQualityGate()
+    _text_processor.ocr_backend.warm_up()
+
+
+def ocr_image(name, image_data):
+    """Decode, preprocess, OCR and parse one image in a worker process"""
+    import cv2
+    import numpy as np
+    from frame_buffer import Frame
+
+    started = time.perf_counter()
+    result = {"name": name}
+    image = cv2.imdecode(np.frombuffer(image_data, dtype=np.uint8), cv2.IMREAD_COLOR)
+    if image is None:
+        result.update(status="error", error="Could not decode image")
+        return result
+
+    frame = Frame.from_array(cv2.cvtColor(image, cv2.COLOR_BGR2RGB))
+    if _quality_gate is not None:
+        usable, reason, stats = _quality_gate.check(frame)
+        if not usable:
+            result.update(status="rejected", error=f"Image {reason}", quality=stats)
+            result["ocr_ms"] = round((time.perf_counter() - started) * 1000, 3)
+            return result
+
+    text, confidence = _text_processor.extract_text(frame)
+    result.update(text=text, confidence=confidence)
+
+    if confidence < MobileConfig.OCR_CONFIDENCE_THRESHOLD:
+        result["status"] = "low_confidence"
+    else:
+        # Worksheets usually hold several questions
+        questions = _text_processor.parse_questions(text)
+        result["questions"] = questions
+        result["status"] = "parsed" if questions else "invalid_mcq"
+
+    result["ocr_ms"] = round((time.perf_counter() - started) * 1000, 3)
+    return result
+
+
+class BatchScanner:
+    """Parallel pipeline: OCR in a process pool, answer search in a thread pool"""
+
+    def __init__(self, ocr_workers=None, search_workers=None, question_solver=None, log_level=logging.INFO):
+        self.ocr_workers = ocr_workers or MobileConfig.BATCH_OCR_WORKERS or os.cpu_count() or 1
+        self.search_workers = search_workers or MobileConfig.BATCH_SEARCH_WORKERS
+        self.log_level = log_level
+        if question_solver is None:
+            from question_solver import QuestionSolver
+            question_solver = QuestionSolver()
+        self.question_solver = question_solver
+
+    def search(self, result):
+        started = time.perf_counter()
+        try:
+            # Answers keyed by question number
+            answers = self.question_solver.solve_questions(result["questions"])
+            result["answers"] = answers
+            failed = all("error" in item_answers for item_answers in answers.values())
+            result["status"] = "error" if failed else "answered"
+        except Exception as e:
+            result.update(status="error", error=str(e))
+        result["search_ms"] = round((time.perf_counter() - started) * 1000, 3)
+        return result
+
+    def scan(self, images):
+        """Yield a result dict per (name, image bytes) as soon as it is ready"""
+        # spawn keeps torch and the logger's listener thread safe in the workers
+        context = multiprocessing.get_context('spawn')
+        ocr_pool = ProcessPoolExecutor(
+            max_workers=self.ocr_workers,
+            mp_context=context,
+            initializer=init_ocr_worker,
+            initargs=(self.log_level,)
+        )
+        search_pool = ThreadPoolExecutor(max_workers=self.search_workers)
+        # Bound the images held in memory while OCR catches up
+        max_in_flight = self.ocr_workers * 2
+
+        ocr_futures = {}
+        search_futures = set()
+        images = iter(images)
+        exhausted = False
+
+        try:
+            while True:
+                while not exhausted and len(ocr_futures) < max_in_flight:
+                    try:
+                        name, image_data = next(images)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    ocr_futures[ocr_pool.submit(ocr_image, name, image_data)] = name
+
+                if not ocr_futures and not search_futures:
+                    break
+
+                done, _ = wait(search_futures.union(ocr_futures), return_when=FIRST_COMPLETED)
+                for future in done:
+                    if future in ocr_futures:
+                        name = ocr_futures.pop(future)
+                        try:
+                            result = future.result()
+                        except Exception as e:
+                            app_logger.error(f"Batch OCR failed for {name}: {str(e)}")
+                            yield {"name": name, "status": "error", "error": str(e)}
+                            continue
+                        if result["status"] == "parsed":
+                            search_futures.add(search_pool.submit(self.search, result))
+                        else:
+                            yield result
+                    else:
+                        search_futures.discard(future)
+                        yield future.result()
+        finally:
+            ocr_pool.shutdown(cancel_futures=True)
+            search_pool.shutdown(cancel_futures=True)
+
+
+def scan_batch(source, **kwargs):
+    """Scan every image in a directory, zip file or '-' tar stream"""
+    return BatchScanner(**kwargs).scan(iter_images(source))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scan a batch of MCQ images without the UI")
+    parser.add_argument("source", help="directory, zip file, or - for a tar stream on stdin")
+    parser.add_argument("--output", help="JSONL output path (default: stdout)")
+    parser.add_argument("--ocr-workers", type=int, help="OCR processes (default: CPU count)")
+    parser.add_argument("--search-workers", type=int, help="search threads")
+    parser.add_argument("--quiet", action="store_true", help="only log warnings and errors")
+    args = parser.parse_args()
+
+    log_level = logging.WARNING if args.quiet else logging.INFO
+    app_logger.set_level(log_level)
+
+    output = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    count = 0
+    started = time.perf_counter()
+    try:
+        for result in scan_batch(args.source, ocr_workers=args.ocr_workers,
+                                 search_workers=args.search_workers, log_level=log_level):
+            output.write(json.dumps(result, ensure_ascii=False) + "\n")
+            output.flush()
+            count += 1
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    elapsed = time.perf_counter() - started
+    print(f"Scanned {count} images in {elapsed:.1f}s ({count / elapsed if elapsed else 0:.2f}/s)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,307 @@
+"""Offline benchmarks for the scan pipeline.
+
+Replays recorded OCR.Space responses and HTML pages from
+benchmarks/fixtures against local stand-in servers, so no camera,
+OCR API or search engine is needed. Results are written as JSON and
+can be compared against a previous run:
+
+    python benchmarks/bench_pipeline.py --iterations 50 --output results.json
+    python benchmarks/bench_pipeline.py --compare results.json
+"""
+import argparse
+import hashlib
+import io
+import json
+import logging
+import os
+import platform
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES_DIR = os.path.join(ROOT_DIR, "benchmarks", "fixtures")
+sys.path.insert(0, ROOT_DIR)
+
+from utils.logger import app_logger
+from utils.metrics import percentile
+from utils.cache import AnswerCache, PageCache
+from utils.http_client import HttpClient
+from text_processor import TextProcessor
+from question_solver import QuestionSolver
+from question_bank import QuestionBank
+from mcq_parser import MCQParser
+
+
+class FixtureServer(ThreadingHTTPServer):
+    """Local stand-in for OCR.Space and the scraped result pages"""
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), FixtureHandler)
+        # OCR response returned for the next /parse/image request
+        self.ocr_response = b"{}"
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server_port}"
+
+    def start(self):
+        thread = threading.Thread(target=self.serve_forever, name="bench-fixture-server")
+        thread.daemon = True
+        thread.start()
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; without this, keep-alive
+    # clients wait on delayed ACKs
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        if self.path != "/parse/image":
+            self.send_error(404)
+            return
+        # Drain the upload like the real API would
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.reply(self.server.ocr_response, "application/json")
+
+    def do_GET(self):
+        if not self.path.startswith("/pages/"):
+            self.send_error(404)
+            return
+        path = os.path.join(FIXTURES_DIR, "pages", os.path.basename(self.path))
+        if not os.path.exists(path):
+            self.send_error(404)
+            return
+        with open(path, "rb") as f:
+            body = f.read()
+
+        etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.reply(body, "text/html; charset=utf-8", {"ETag": etag})
+
+    def reply(self, body, content_type, headers=None):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def load_cases():
+    """Load benchmark cases and their recorded fixtures"""
+    with open(os.path.join(FIXTURES_DIR, "cases.json"), encoding="utf-8") as f:
+        cases = json.load(f)
+
+    for case in cases:
+        with open(os.path.join(FIXTURES_DIR, case["ocr_response"]), "rb") as f:
+            case["ocr_response_body"] = f.read()
+        case["ocr_text"] = json.loads(case["ocr_response_body"])["ParsedResults"][0]["ParsedText"]
+        case["frame"] = render_frame(case["ocr_text"])
+    return cases
+
+
+def check_parser():
+    """Parse the fixture texts and compare questions and options with the expected ones"""
+    with open(os.path.join(FIXTURES_DIR, "parser_cases.json"), encoding="utf-8") as f:
+        cases = json.load(f)
+
+    parser = MCQParser()
+    results = {}
+    for case in cases:
+        parsed = [
+            {"question": item["question"], "options": item["options"]}
+            for item in parser.parse(case["text"])
+        ]
+        results[case["name"]] = {"parsed": parsed, "correct": parsed == case["expected"]}
+        if parsed != case["expected"]:
+            print(f"Parser case {case['name']} failed: {parsed}")
+    return results
+
+
+def render_frame(text):
+    """Render OCR text onto a camera-sized JPEG to stand in for a captured frame"""
+    from PIL import Image, ImageDraw
+
+    image = Image.new("RGB", (640, 480), "white")
+    draw = ImageDraw.Draw(image)
+    draw.multiline_text((20, 20), text.replace("\r\n", "\n"), fill="black", spacing=12)
+
+    stream = io.BytesIO()
+    image.save(stream, format="JPEG", quality=85)
+    return stream.getvalue()
+
+
+def measure(name, func, iterations):
+    """Time func over iterations, then trace one extra run for peak memory"""
+    func()  # Warm up connections and caches
+
+    durations = []
+    start = time.perf_counter()
+    for _ in range(iterations):
+        began = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - began)
+    elapsed = time.perf_counter() - start
+
+    # Memory is traced separately so tracing does not distort the timings
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    durations.sort()
+    result = {
+        "iterations": iterations,
+        "throughput_per_s": iterations / elapsed if elapsed else 0.0,
+        "mean_ms": sum(durations) / len(durations) * 1000,
+        "p50_ms": percentile(durations, 50) * 1000,
+        "p95_ms": percentile(durations, 95) * 1000,
+        "p99_ms": percentile(durations, 99) * 1000,
+        "max_ms": durations[-1] * 1000,
+        "peak_memory_kb": peak / 1024,
+    }
+    print(f"{name:<28} p50 {result['p50_ms']:9.3f} ms  p95 {result['p95_ms']:9.3f} ms  "
+          f"{result['throughput_per_s']:10.1f}/s  peak {result['peak_memory_kb']:9.1f} KB")
+    return result
+
+
+def run_benchmarks(iterations):
+    """Run every stage benchmark and return the results document"""
+    server = FixtureServer()
+    server.start()
+    cache_dir = tempfile.mkdtemp(prefix="mcq-bench-")
+
+    try:
+        cases = load_cases()
+        processor = TextProcessor()
+        processor.ocr_backend.api_url = f"{server.base_url}/parse/image"
+        # Repeated frames would otherwise be answered from the dedup window, not OCR
+        processor.ocr_flights.linger = 0
+        solver = QuestionSolver(
+            cache=AnswerCache(db_path=os.path.join(cache_dir, "answers.db")),
+            http_client=HttpClient(page_cache=PageCache(db_path=os.path.join(cache_dir, "pages.db"))),
+            question_bank=QuestionBank(db_path=os.path.join(cache_dir, "question_bank.db"))
+        )
+
+        for case in cases:
+            case["question"], case["options"] = processor.parse_mcq(case["ocr_text"])
+            case["urls"] = [f"{server.base_url}/{page}" for page in case["pages"]]
+            case["page_texts"] = [solver.extract_page_content(url) for url in case["urls"]]
+
+        def extract_text():
+            for case in cases:
+                server.ocr_response = case["ocr_response_body"]
+                processor.extract_text(case["frame"])
+
+        def parse_mcq():
+            for case in cases:
+                processor.parse_mcq(case["ocr_text"])
+
+        def find_answers_in_content():
+            for case in cases:
+                for page_text in case["page_texts"]:
+                    solver.find_answers_in_content(page_text, case["question"], case["options"])
+
+        def analyze_results():
+            for case in cases:
+                solver.analyze_results(case["urls"], case["question"], case["options"])
+
+        stages = {}
+        for name, func in [
+            ("extract_text", extract_text),
+            ("parse_mcq", parse_mcq),
+            ("find_answers_in_content", find_answers_in_content),
+            ("analyze_results", analyze_results),
+        ]:
+            stages[name] = measure(name, func, iterations)
+
+        accuracy = {}
+        for case in cases:
+            answers = solver.analyze_results(case["urls"], case["question"], case["options"])
+            accuracy[case["name"]] = {
+                "expected": case["expected"],
+                "answers": answers,
+                "correct": sorted(answers) == sorted(case["expected"]),
+            }
+    finally:
+        server.stop()
+
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cases": len(cases),
+        "stages": stages,
+        "accuracy": accuracy,
+        "parsing": check_parser(),
+    }
+
+
+def compare(current, baseline_path, max_regression):
+    """Print latency changes against a previous run; return False on regression"""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)
+
+    ok = True
+    print(f"\nCompared with {baseline_path} ({baseline.get('timestamp', 'unknown')}):")
+    for name, result in current["stages"].items():
+        previous = baseline.get("stages", {}).get(name)
+        if not previous or not previous.get("p50_ms"):
+            print(f"{name:<28} no baseline")
+            continue
+        change = (result["p50_ms"] - previous["p50_ms"]) / previous["p50_ms"] * 100
+        flag = ""
+        if change > max_regression:
+            flag = "  REGRESSION"
+            ok = False
+        print(f"{name:<28} p50 {previous['p50_ms']:9.3f} -> {result['p50_ms']:9.3f} ms ({change:+6.1f}%){flag}")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline MCQ pipeline benchmarks")
+    parser.add_argument("--iterations", type=int, default=20, help="timed runs per stage")
+    parser.add_argument("--output", help="write results JSON to this path")
+    parser.add_argument("--compare", help="previous results JSON to compare against")
+    parser.add_argument("--max-regression", type=float, default=20.0,
+                        help="p50 slowdown in percent that fails the comparison")
+    parser.add_argument("--verbose", action="store_true", help="keep app INFO logging")
+    args = parser.parse_args()
+
+    if not args.verbose:
+        app_logger.set_level(logging.WARNING)
+
+    results = run_benchmarks(args.iterations)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+    if args.compare and not compare(results, args.compare, args.max_regression):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
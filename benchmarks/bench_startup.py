@@ -0,0 +1,91 @@
+"""Import-time profile of the app's modules.
+
+Imports each module in a fresh interpreter with `python -X importtime`
+and reports the total import cost and the slowest dependencies, so
+startup regressions from new imports show up before they reach a
+device:
+
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py main text_processor --top 15 --output startup.json
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from datetime import datetime
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# What the app imports before the first frame, and what is deferred to warm-up
+DEFAULT_MODULES = ["main", "mobile_camera", "text_processor", "question_solver"]
+
+
+def profile_import(module, runs):
+    """Return the best of several cold imports as {package: (self_us, cumulative_us)}"""
+    best = None
+    for _ in range(runs):
+        completed = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=ROOT_DIR, capture_output=True, text=True
+        )
+        if completed.returncode != 0:
+            error = completed.stderr.strip().splitlines()
+            raise RuntimeError(f"import {module} failed: {error[-1] if error else completed.returncode}")
+
+        timings = {}
+        for line in completed.stderr.splitlines():
+            if not line.startswith("import time:") or "self [us]" in line:
+                continue
+            self_us, cumulative_us, package = line[len("import time:"):].split("|")
+            timings[package.strip()] = (int(self_us), int(cumulative_us))
+
+        if best is None or timings.get(module, (0, 0))[1] < best.get(module, (0, 0))[1]:
+            best = timings
+    return best
+
+
+def report(module, timings, top):
+    total_ms = timings.get(module, (0, 0))[1] / 1000
+    slowest = sorted(timings.items(), key=lambda item: item[1][0], reverse=True)[:top]
+    print(f"\nimport {module}: {total_ms:.1f} ms cumulative, {len(timings)} modules")
+    for package, (self_us, cumulative_us) in slowest:
+        print(f"  {package:<40} self {self_us / 1000:8.1f} ms  cumulative {cumulative_us / 1000:8.1f} ms")
+    return {
+        "total_ms": total_ms,
+        "modules": len(timings),
+        "slowest": [
+            {"module": package, "self_ms": self_us / 1000, "cumulative_ms": cumulative_us / 1000}
+            for package, (self_us, cumulative_us) in slowest
+        ],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import-time profile of app modules")
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES, help="modules to import")
+    parser.add_argument("--runs", type=int, default=3, help="cold imports per module; the fastest is kept")
+    parser.add_argument("--top", type=int, default=10, help="slowest dependencies to list")
+    parser.add_argument("--output", help="write results JSON to this path")
+    args = parser.parse_args()
+
+    results = {}
+    for module in args.modules:
+        try:
+            results[module] = report(module, profile_import(module, args.runs), args.top)
+        except RuntimeError as e:
+            print(f"\n{e}")
+            results[module] = {"error": str(e)}
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({
+                "timestamp": datetime.now().isoformat(timespec="seconds"),
+                "python": sys.version.split()[0],
+                "results": results,
+            }, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+import time
+from utils.logger import app_logger
+from utils.config import MobileConfig
+from frame_filters import FrameChangeDetector, frame_thumbnail
+
+class AdaptiveCaptureScheduler:
+    """Decides when auto mode should scan.
+
+    The camera is polled at a short interval. A frame is only scanned
+    once the scene has held still for a few polls, the pipeline is idle,
+    at least one recent pipeline latency has passed since the last scan
+    and the page differs from the one scanned last. While the same page
+    stays in view the poll interval backs off up to AUTO_CAPTURE_INTERVAL.
+    """
+
+    def __init__(self, change_detector=None):
+        self.change_detector = change_detector or FrameChangeDetector()
+        self.latency = None
+        self.reset()
+
+    def reset(self):
+        self.previous_thumbnail = None
+        self.steady_polls = 0
+        self.poll_interval = MobileConfig.AUTO_CAPTURE_POLL_INTERVAL
+        self.last_capture = None
+        self.retry_after_motion = False
+        self.change_detector.reset()
+
+    def record_latency(self, seconds):
+        """Feed back the end-to-end time of a finished auto scan"""
+        alpha = MobileConfig.AUTO_LATENCY_ALPHA
+        self.latency = seconds if self.latency is None else (1 - alpha) * self.latency + alpha * seconds
+
+    def motion(self, thumbnail):
+        """Mean absolute difference to the previous poll, 0-1 scale"""
+        previous, self.previous_thumbnail = self.previous_thumbnail, thumbnail
+        if previous is None or previous.shape != thumbnail.shape:
+            return 1.0
+        import numpy as np
+        return float(np.abs(thumbnail.astype(np.int16) - previous.astype(np.int16)).mean()) / 255.0
+
+    def should_capture(self, frame, pipeline_busy, now=None):
+        """Return True if this frame should be sent to the pipeline"""
+        now = time.monotonic() if now is None else now
+        thumbnail = frame_thumbnail(frame)
+
+        if self.motion(thumbnail) > MobileConfig.AUTO_STABLE_THRESHOLD:
+            # Camera or page is moving: wait for it to settle, polling at full rate
+            self.steady_polls = 0
+            self.poll_interval = MobileConfig.AUTO_CAPTURE_POLL_INTERVAL
+            if self.retry_after_motion:
+                # The camera moved since a rejected capture; the page may be readable once it settles
+                self.retry_after_motion = False
+                self.change_detector.reset()
+            return False
+
+        self.steady_polls += 1
+        if self.steady_polls < MobileConfig.AUTO_STABLE_POLLS or pipeline_busy:
+            return False
+
+        # Do not offer work faster than the pipeline has been finishing it
+        if self.last_capture is not None and self.latency and now - self.last_capture < self.latency:
+            return False
+
+        if self.change_detector.difference(thumbnail) < self.change_detector.threshold:
+            # Same page as the last scan: back off until something changes
+            self.poll_interval = min(self.poll_interval * 2, MobileConfig.AUTO_CAPTURE_INTERVAL)
+            return False
+
+        self.change_detector.remember(thumbnail)
+        self.last_capture = now
+        self.poll_interval = MobileConfig.AUTO_CAPTURE_POLL_INTERVAL
+        app_logger.debug("Steady new page, capturing (latency %s)", self.latency)
+        return True
+
+    def capture_rejected(self):
+        """The last capture failed the quality gate; capture the same page again after the camera moves"""
+        self.retry_after_motion = True
@@ -0,0 +1,65 @@
+import io
+
+class Frame:
+    """Camera frame that wraps the raw pixel buffer without copying it"""
+
+    def __init__(self, pixels, size, channels=4):
+        self.pixels = pixels
+        self.size = size
+        width, height = size
+        import numpy as np
+        # np.frombuffer creates a view over the texture bytes, not a copy
+        self.array = np.frombuffer(pixels, dtype=np.uint8).reshape(height, width, channels)
+
+    @classmethod
+    def from_array(cls, array):
+        """Wrap an existing (height, width[, channels]) array"""
+        frame = cls.__new__(cls)
+        frame.pixels = array
+        frame.array = array
+        frame.size = (array.shape[1], array.shape[0])
+        return frame
+
+    @property
+    def channels(self):
+        return 1 if self.array.ndim == 2 else self.array.shape[2]
+
+    def crop(self, left, top, right, bottom):
+        """Return a view of a region of this frame"""
+        return Frame.from_array(self.array[top:bottom, left:right])
+
+    def gray(self):
+        """Return the frame as a single-channel array"""
+        if self.channels == 1:
+            return self.array
+        import cv2
+        code = cv2.COLOR_RGBA2GRAY if self.channels == 4 else cv2.COLOR_RGB2GRAY
+        return cv2.cvtColor(self.array, code)
+
+    def to_image(self):
+        """Return a PIL image sharing memory with the frame where possible"""
+        from PIL import Image
+
+        mode = {1: 'L', 3: 'RGB', 4: 'RGBA'}[self.channels]
+        if self.array.flags['C_CONTIGUOUS']:
+            return Image.frombuffer(mode, self.size, self.array, 'raw', mode, 0, 1)
+        return Image.fromarray(self.array, mode)
+
+    def encode(self, image_format='JPEG', quality=85):
+        """Encode once into an in-memory file ready to upload"""
+        image = self.to_image()
+        options = {}
+        if image_format == 'JPEG':
+            options['quality'] = quality
+            if image.mode == 'RGBA':
+                # JPEG has no alpha channel
+                image = image.convert('RGB')
+        elif image_format == 'PNG' and image.mode == 'L':
+            # Binarized frames pack to 1 bit per pixel
+            image = image.convert('1', dither=0)
+            options['optimize'] = True
+
+        stream = io.BytesIO()
+        image.save(stream, format=image_format, **options)
+        stream.seek(0)
+        return stream
@@ -0,0 +1,122 @@
+import hashlib
+import threading
+from utils.logger import app_logger
+from utils.config import MobileConfig
+
+def frame_thumbnail(frame, thumb_width=None):
+    """Downscale an RGBA frame to a small grayscale array by striding"""
+    import numpy as np
+    thumb_width = thumb_width or MobileConfig.FRAME_THUMB_WIDTH
+    width, height = frame.size
+    pixels = frame.array
+
+    step = max(1, width // thumb_width)
+    small = pixels[::step, ::step].astype(np.uint16)
+    # Cheap integer luma approximation: (R + 2G + B) / 4
+    return ((small[..., 0] + 2 * small[..., 1] + small[..., 2]) >> 2).astype(np.uint8)
+
+
+class FrameChangeDetector:
+    """Skip frames that look the same as the last processed one"""
+
+    def __init__(self, threshold=None):
+        self.threshold = MobileConfig.FRAME_CHANGE_THRESHOLD if threshold is None else threshold
+        self.last_thumbnail = None
+
+    def difference(self, thumbnail):
+        """Mean absolute difference to the last processed frame, 0-1 scale"""
+        if self.last_thumbnail is None or self.last_thumbnail.shape != thumbnail.shape:
+            return 1.0
+        import numpy as np
+        diff = np.abs(thumbnail.astype(np.int16) - self.last_thumbnail.astype(np.int16))
+        return float(diff.mean()) / 255.0
+
+    def remember(self, thumbnail):
+        """Use this thumbnail as the reference for later comparisons"""
+        self.last_thumbnail = thumbnail
+
+    def reset(self):
+        """Forget the reference frame so the next one is always processed"""
+        self.last_thumbnail = None
+
+
+class SimilarFrames:
+    """Give near-identical captures of the same page the same key.
+
+    Frames are matched by thumbnail difference against
+    FRAME_CHANGE_THRESHOLD rather than by an exact hash, since sensor
+    noise changes some pixels of every capture. Encoded image bytes are
+    keyed by their hash.
+    """
+
+    def __init__(self, threshold=None):
+        self.threshold = threshold
+        self.detectors = {}
+        self.next_id = 0
+        self.lock = threading.Lock()
+
+    def key(self, frame, live_keys):
+        """Key of a live frame that matches this one, or a new key; None for unknown inputs.
+
+        live_keys are the keys still in use; other remembered frames are forgotten.
+        """
+        if isinstance(frame, (bytes, bytearray)):
+            return hashlib.blake2b(frame, digest_size=16).hexdigest()
+        if not hasattr(frame, "array"):
+            return None
+
+        thumbnail = frame_thumbnail(frame)
+        with self.lock:
+            for key in [key for key in self.detectors if key not in live_keys]:
+                del self.detectors[key]
+            for key, detector in self.detectors.items():
+                if detector.difference(thumbnail) < detector.threshold:
+                    return key
+
+            self.next_id += 1
+            key = f"frame-{self.next_id}"
+            detector = FrameChangeDetector(self.threshold)
+            detector.remember(thumbnail)
+            self.detectors[key] = detector
+            return key
+
+
+class FrameQualityGate:
+    """Cheap blur, exposure and text-density checks that run before OCR"""
+
+    def __init__(self, width=None):
+        self.width = width or MobileConfig.QUALITY_WIDTH
+
+    def measure(self, frame):
+        """Sharpness, brightness and edge density of a downscaled grayscale frame"""
+        import cv2
+        import numpy as np
+        gray = frame.gray()
+        height, width = gray.shape[:2]
+        if width > self.width:
+            gray = cv2.resize(gray, (self.width, max(1, height * self.width // width)), interpolation=cv2.INTER_AREA)
+
+        edges = cv2.Canny(gray, 50, 150)
+        return {
+            "sharpness": float(cv2.Laplacian(gray, cv2.CV_32F).var()),
+            "brightness": float(gray.mean()),
+            "edge_density": float(np.count_nonzero(edges)) / edges.size,
+        }
+
+    def check(self, frame):
+        """Return (usable, reason, measurements); reason explains a rejection"""
+        stats = self.measure(frame)
+        reason = None
+        if stats["brightness"] < MobileConfig.QUALITY_MIN_BRIGHTNESS:
+            reason = "too dark"
+        elif stats["edge_density"] < MobileConfig.QUALITY_MIN_EDGE_DENSITY:
+            # White paper is bright anyway; bright without edges means the text is washed out
+            reason = "overexposed" if stats["brightness"] > MobileConfig.QUALITY_MAX_BRIGHTNESS else "no text in view"
+        elif stats["sharpness"] < MobileConfig.QUALITY_MIN_SHARPNESS:
+            reason = "too blurry"
+        elif stats["edge_density"] > MobileConfig.QUALITY_MAX_EDGE_DENSITY:
+            reason = "too cluttered to read"
+
+        if reason:
+            app_logger.debug("Frame rejected (%s): %s", reason, stats)
+        return reason is None, reason, stats
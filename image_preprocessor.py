@@ -0,0 +1,77 @@
+import numpy as np
+from utils.logger import app_logger
+from utils.config import MobileConfig
+from frame_buffer import Frame
+
+class ImagePreprocessor:
+    """Clean up camera frames before OCR: crop to text, deskew, binarize"""
+
+    def __init__(self, max_width=None):
+        self.max_width = max_width or MobileConfig.PREPROCESS_MAX_WIDTH
+
+    def process(self, frame):
+        """Return a binarized single-channel Frame of the text region"""
+        import cv2
+
+        gray = frame.gray()
+
+        # Downscale large frames; OCR does not need more than this
+        height, width = gray.shape
+        if width > self.max_width:
+            scale = self.max_width / width
+            gray = cv2.resize(gray, (self.max_width, int(height * scale)), interpolation=cv2.INTER_AREA)
+
+        binary = cv2.adaptiveThreshold(
+            gray, 255,
+            cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
+            cv2.THRESH_BINARY,
+            MobileConfig.PREPROCESS_BLOCK_SIZE,
+            MobileConfig.PREPROCESS_THRESHOLD_OFFSET
+        )
+
+        # Text pixels are dark; merge characters into blobs to find the text block
+        ink = cv2.bitwise_not(binary)
+        kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (15, 3))
+        blobs = cv2.morphologyEx(ink, cv2.MORPH_OPEN, np.ones((2, 2), np.uint8))
+        blobs = cv2.dilate(blobs, kernel, iterations=1)
+
+        points = cv2.findNonZero(blobs)
+        if points is None:
+            app_logger.info("Preprocessing found no text region, using full frame")
+            return Frame.from_array(binary)
+
+        binary = self.crop_to_text(binary, cv2.boundingRect(points))
+        binary = self.deskew(binary, points)
+        app_logger.info(f"Preprocessed frame to {binary.shape[1]}x{binary.shape[0]}")
+        return Frame.from_array(binary)
+
+    def deskew(self, binary, points):
+        """Rotate the image so text lines are horizontal"""
+        import cv2
+
+        angle = cv2.minAreaRect(points)[-1]
+        # minAreaRect reports angles in [0, 90); map to the smallest rotation
+        if angle > 45:
+            angle -= 90
+        if abs(angle) < MobileConfig.PREPROCESS_MIN_SKEW or abs(angle) > MobileConfig.PREPROCESS_MAX_SKEW:
+            return binary
+
+        height, width = binary.shape
+        matrix = cv2.getRotationMatrix2D((width / 2, height / 2), angle, 1.0)
+        return cv2.warpAffine(
+            binary, matrix, (width, height),
+            flags=cv2.INTER_NEAREST,
+            borderMode=cv2.BORDER_CONSTANT,
+            borderValue=255
+        )
+
+    def crop_to_text(self, binary, rect):
+        """Crop to the text bounding box plus a margin"""
+        x, y, w, h = rect
+        margin = MobileConfig.PREPROCESS_MARGIN
+        height, width = binary.shape
+        top = max(0, y - margin)
+        bottom = min(height, y + h + margin)
+        left = max(0, x - margin)
+        right = min(width, x + w + margin)
+        return binary[top:bottom, left:right]
@@ -1,4 +1,7 @@
 # main.py
+import time
+APP_STARTED = time.perf_counter()
+
 from kivymd.app import MDApp
 from kivymd.uix.boxlayout import MDBoxLayout
 from kivymd.uix.label import MDLabel
@@ -7,17 +10,19 @@ from kivymd.uix.card import MDCard
 from kivymd.uix.progressbar import MDProgressBar
 from kivymd.uix.snackbar import Snackbar
 from kivy.clock import Clock
-from kivy.graphics.texture import Texture
 import threading
-import io
-import os
-import datetime
+from contextlib import closing
 
+# The OCR and scraping stacks (requests, numpy, OpenCV, EasyOCR) are imported
+# on first use or by the background warm-up, not at startup; the camera
+# modules only import numpy once the first frame is processed
 from mobile_camera import MobileCameraController
-from text_processor import TextProcessor
-from question_solver import QuestionSolver
+from scan_scheduler import ScanScheduler
+from frame_filters import FrameQualityGate
 from utils.logger import app_logger
 from utils.config import MobileConfig
+from utils.journal import ScanJournal
+from utils.metrics import metrics
 
 class MCQMobileApp(MDBoxLayout):
     def __init__(self, **kwargs):
@@ -26,22 +31,93 @@ class MCQMobileApp(MDBoxLayout):
         self.padding = "10dp"
         self.spacing = "10dp"
         
-        # Initialize components
+        # Initialize components; OCR and search are created lazily
         self.camera_controller = MobileCameraController()
-        self.text_processor = TextProcessor()
-        self.question_solver = QuestionSolver()
+        self._text_processor = None
+        self._question_solver = None
+        self.components_lock = threading.Lock()
+        # Runs on the scan workers so the cv2 checks never block the UI thread
+        self.quality_gate = FrameQualityGate() if MobileConfig.QUALITY_GATE else None
         
         self.current_question = None
-        self.is_processing = False
         self.capture_mode = MobileConfig.MANUAL_MODE
         
-        # Create logs directory if it doesn't exist
-        self.logs_dir = "logs"
-        os.makedirs(self.logs_dir, exist_ok=True)
+        # Persistent workers process captures; newer frames replace stale ones
+        self.scheduler = ScanScheduler(
+            self.run_pipeline,
+            on_idle=lambda: Clock.schedule_once(lambda dt: self.processing_complete())
+        )
+        
+        # Structured record of every scan for offline analysis
+        self.journal = ScanJournal()
+        # Write records left over when scanning goes idle; Android rarely runs atexit
+        Clock.schedule_interval(lambda dt: self.journal.flush(), MobileConfig.JOURNAL_FLUSH_INTERVAL)
+        
+        # Optional local Prometheus endpoint for stage latencies
+        if MobileConfig.METRICS_PORT:
+            metrics.start_server(MobileConfig.METRICS_PORT)
         
         app_logger.info("MCQMobileApp UI initializing")
         self.setup_ui()
-        self.start_camera()
+        self.mark_startup("ui_ready")
+        
+        # Open the camera once the first UI frame has been drawn
+        Clock.schedule_once(lambda dt: self.start_camera())
+    
+    @property
+    def text_processor(self):
+        if self._text_processor is None:
+            with self.components_lock:
+                if self._text_processor is None:
+                    from text_processor import TextProcessor
+                    self._text_processor = TextProcessor()
+        return self._text_processor
+    
+    @property
+    def question_solver(self):
+        if self._question_solver is None:
+            with self.components_lock:
+                if self._question_solver is None:
+                    from question_solver import QuestionSolver
+                    self._question_solver = QuestionSolver()
+        return self._question_solver
+    
+    def mark_startup(self, phase):
+        """Record time since process start for a startup phase"""
+        elapsed = time.perf_counter() - APP_STARTED
+        metrics.record(f"startup_{phase}", elapsed)
+        app_logger.info(f"Startup {phase} after {elapsed * 1000:.0f} ms")
+    
+    def on_first_preview(self, camera, texture):
+        """Start warming up heavy engines once the preview is on screen"""
+        if texture is None:
+            return
+        camera.unbind(texture=self.on_first_preview)
+        self.mark_startup("first_preview")
+        self.start_warm_up()
+    
+    def start_warm_up(self):
+        """Import and load OCR and search in the background so the first scan is not slowed down"""
+        def warm_up():
+            started = time.perf_counter()
+            try:
+                ocr_backend = self.text_processor.ocr_backend
+                ocr_backend.warm_up()
+                # Creating the solver imports requests and opens the caches
+                providers = self.question_solver.search_router.providers
+            except Exception as e:
+                app_logger.error(f"Warm-up failed: {str(e)}")
+                return
+            elapsed = time.perf_counter() - started
+            metrics.record("warm_up", elapsed)
+            app_logger.info(
+                f"Engines warmed up in {elapsed:.2f}s "
+                f"(OCR: {ocr_backend.name}, search: {', '.join(p.name for p in providers)})"
+            )
+        
+        warm_up_thread = threading.Thread(target=warm_up, name="warm-up")
+        warm_up_thread.daemon = True
+        warm_up_thread.start()
     
     def setup_ui(self):
         """Setup KivyMD mobile-optimized UI"""
@@ -167,45 +243,34 @@ class MCQMobileApp(MDBoxLayout):
             # Fallback: just log the message
             app_logger.info(f"Snackbar message: {message}")
     
-    def log_extracted_text(self, text, confidence, success=True):
-        """Log extracted text to a file for debugging"""
-        try:
-            timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            log_file = os.path.join(self.logs_dir, "extracted_text.log")
-            
-            with open(log_file, "a", encoding="utf-8") as f:
-                f.write(f"\n{'='*60}\n")
-                f.write(f"Timestamp: {timestamp}\n")
-                f.write(f"Confidence: {confidence}\n")
-                f.write(f"Status: {'SUCCESS' if success else 'FAILED'}\n")
-                f.write(f"Extracted Text:\n{text}\n")
-                f.write(f"{'='*60}\n\n")
-            
-            app_logger.info(f"Extracted text logged to {log_file}")
-        except Exception as e:
-            app_logger.error(f"Failed to log extracted text: {str(e)}")
-    
     def start_camera(self):
         """Initialize and start camera"""
         if self.camera_controller.initialize_camera():
             self.camera_preview.add_widget(self.camera_controller.camera)
             self.status_label.text = "Camera ready. Tap capture or use auto mode."
             app_logger.info("Camera started successfully")
+            camera = self.camera_controller.camera
+            camera.bind(texture=self.on_first_preview)
+            if camera.texture is not None:
+                self.on_first_preview(camera, camera.texture)
             
             # Set up auto-capture callback
-            self.camera_controller.set_capture_callback(self.process_captured_image)
+            self.camera_controller.set_capture_callback(
+                lambda image_data: self.process_captured_image(image_data, MobileConfig.AUTO_MODE)
+            )
         else:
             self.status_label.text = "Camera not available"
             self.show_snackbar("Camera initialization failed!")
             app_logger.error("Camera could not be started")
+            self.start_warm_up()
     
     def toggle_mode(self, instance):
         """Toggle between manual and auto capture modes"""
         if self.capture_mode == MobileConfig.MANUAL_MODE:
             self.capture_mode = MobileConfig.AUTO_MODE
             self.mode_btn.text = "Manual Mode"
-            self.camera_controller.start_auto_capture()
-            self.status_label.text = "Auto mode: Scanning every 2 seconds"
+            self.camera_controller.start_auto_capture(self.scheduler.is_busy)
+            self.status_label.text = "Auto mode: Hold the page steady to scan"
             self.show_snackbar("Auto capture mode activated")
             app_logger.info("Switched to auto capture mode")
         else:
@@ -218,80 +283,147 @@ class MCQMobileApp(MDBoxLayout):
     
     def capture_manual(self, instance):
         """Manual capture button handler"""
-        if self.is_processing:
-            self.show_snackbar("Already processing, please wait...")
-            return
-        
         self.status_label.text = "Capturing image..."
         app_logger.info("Manual capture triggered")
         
         # Capture image
         image_data = self.camera_controller.capture_image()
         if image_data:
-            self.process_captured_image(image_data)
+            self.process_captured_image(image_data, MobileConfig.MANUAL_MODE)
         else:
             self.status_label.text = "Capture failed"
             self.show_snackbar("Capture failed!")
     
-    def process_captured_image(self, image_data):
-        """Process captured image through OCR and search"""
-        if self.is_processing:
-            return
-            
-        self.is_processing = True
+    def process_captured_image(self, image_data, source=MobileConfig.MANUAL_MODE):
+        """Queue captured image for OCR and search"""
         self.progress_bar.opacity = 1
         self.progress_bar.start()
         
-        app_logger.info("Starting image processing pipeline")
+        app_logger.info(f"Queueing {source} capture for processing")
         self.status_label.text = "Processing image..."
+        self.scheduler.submit(image_data, source)
+    
+    def set_status(self, text):
+        """Update status label from any thread"""
+        Clock.schedule_once(lambda dt: setattr(self.status_label, 'text', text))
+    
+    def run_pipeline(self, job):
+        """Run OCR and search for a scan job on a worker thread"""
+        scan = {"job_id": job.job_id, "source": job.source, "confidence": 0.0}
+        with metrics.collect() as timings:
+            scan["timings"] = timings
+            self.run_stages(job, scan)
         
-        def processing_thread():
-            try:
-                # Step 1: OCR text extraction
-                self.status_label.text = "Extracting text..."
+        if job.source == MobileConfig.AUTO_MODE and scan.get("status") not in ("superseded", "rejected"):
+            # Auto mode paces itself to how long scans actually take
+            self.camera_controller.capture_scheduler.record_latency(time.perf_counter() - job.created)
+        
+        # Journal every scan regardless of outcome
+        self.journal.record(**scan)
+    
+    def run_stages(self, job, scan):
+        """Run each pipeline stage, filling in the scan record"""
+        image_data = job.image_data
+        try:
+            # Frames that cannot produce a question are rejected before spending an OCR call
+            if self.quality_gate:
+                with metrics.span("quality_gate"):
+                    usable, reason, _ = self.quality_gate.check(image_data)
+                if not usable:
+                    scan.update(status="rejected", error=reason)
+                    if job.source == MobileConfig.AUTO_MODE:
+                        # The scheduler retries the same page once the camera has been moved
+                        Clock.schedule_once(lambda dt: self.camera_controller.capture_scheduler.capture_rejected())
+                        self.set_status(f"Image {reason}, adjust the camera")
+                    else:
+                        Clock.schedule_once(lambda dt: self.display_error(f"Image {reason}, try again"))
+                    return
+
+            # Step 1: OCR text extraction
+            self.set_status("Extracting text...")
+            with metrics.span("extract_text"):
                 text, confidence = self.text_processor.extract_text(image_data)
-                app_logger.info(f"OCR confidence: {confidence:.2f}")
-                
-                # Log extracted text regardless of confidence
-                self.log_extracted_text(text, confidence, success=(confidence >= MobileConfig.OCR_CONFIDENCE_THRESHOLD))
+            app_logger.info(f"OCR confidence: {confidence:.2f}")
+            scan.update(text=text, confidence=confidence)
+            
+            if job.is_cancelled():
+                app_logger.info(f"Job {job.job_id} superseded after OCR")
+                scan["status"] = "superseded"
+                return
+            
+            if confidence >= MobileConfig.OCR_CONFIDENCE_THRESHOLD:
+                # Step 2: Parse MCQ (a page may hold several questions)
+                with metrics.span("parse_mcq"):
+                    questions = self.text_processor.parse_questions(text)
+                scan["questions"] = questions
                 
-                if confidence >= MobileConfig.OCR_CONFIDENCE_THRESHOLD:
-                    # Step 2: Parse MCQ
-                    question, options = self.text_processor.parse_mcq(text)
+                if len(questions) > 1:
+                    app_logger.info(f"Found {len(questions)} questions on page")
                     
-                    if self.text_processor.is_valid_question(question, options):
-                        app_logger.info(f"Valid question: {question[:50]}...")
-                        
-                        # Step 3: Search for answer
-                        self.status_label.text = "Searching for answer..."
-                        answers = self.question_solver.search_question(question, options)
-                        
-                        # Update UI in main thread
-                        Clock.schedule_once(lambda dt: self.display_results(
-                            question, options, answers, confidence
-                        ))
-                    else:
-                        Clock.schedule_once(lambda dt: self.display_error(
-                            "No valid MCQ format detected"
-                        ))
+                    # Step 3: Search all questions concurrently
+                    self.set_status(f"Searching {len(questions)} questions...")
+                    with metrics.span("search_question"):
+                        answers = self.question_solver.solve_questions(questions)
+                    scan["answers"] = answers
+                    
+                    if job.is_cancelled():
+                        app_logger.info(f"Job {job.job_id} superseded after search")
+                        scan["status"] = "superseded"
+                        return
+                    
+                    scan["status"] = "answered"
+                    Clock.schedule_once(lambda dt: self.display_multi_results(
+                        questions, answers, confidence
+                    ))
+                elif questions:
+                    question, options = questions[0]["question"], questions[0]["options"]
+                    app_logger.info(f"Valid question: {question[:50]}...")
+                    
+                    # Step 3: Search for answer, showing provisional answers page by page
+                    self.set_status("Searching for answer...")
+                    answers = ["Not found"]
+                    with metrics.span("search_question"), \
+                            closing(self.question_solver.iter_search(question, options)) as updates:
+                        for update in updates:
+                            if job.is_cancelled():
+                                # Closing the generator cancels the remaining page fetches
+                                break
+                            if "error" in update:
+                                answers = {"error": update["error"]}
+                                break
+                            answers = update["answers"]
+                            if not update["final"]:
+                                Clock.schedule_once(lambda dt, update=update: self.display_progress(
+                                    question, options, update
+                                ))
+                    scan["answers"] = answers
+                    
+                    if job.is_cancelled():
+                        app_logger.info(f"Job {job.job_id} superseded after search")
+                        scan["status"] = "superseded"
+                        return
+                    
+                    scan["status"] = "answered"
+                    # Update UI in main thread
+                    Clock.schedule_once(lambda dt: self.display_results(
+                        question, options, answers, confidence
+                    ))
                 else:
+                    scan["status"] = "invalid_mcq"
                     Clock.schedule_once(lambda dt: self.display_error(
-                        f"Low text confidence: {confidence:.2f}"
+                        "No valid MCQ format detected"
                     ))
-                    
-            except Exception as e:
-                app_logger.error(f"Processing error: {str(e)}")
-                # Log the error with empty text to indicate failure
-                self.log_extracted_text("EXTRACTION FAILED - " + str(e), 0.0, success=False)
-                Clock.schedule_once(lambda dt: self.display_error(str(e)))
-            
-            finally:
-                Clock.schedule_once(lambda dt: self.processing_complete())
-        
-        # Run processing in background thread
-        thread = threading.Thread(target=processing_thread)
-        thread.daemon = True
-        thread.start()
+            else:
+                scan["status"] = "low_confidence"
+                Clock.schedule_once(lambda dt: self.display_error(
+                    f"Low text confidence: {confidence:.2f}"
+                ))
+                
+        except Exception as e:
+            app_logger.error(f"Processing error: {str(e)}")
+            error_msg = str(e)
+            scan.update(status="error", error=error_msg)
+            Clock.schedule_once(lambda dt: self.display_error(error_msg))
     
     def display_results(self, question, options, answers, confidence):
         """Display search results"""
@@ -315,6 +447,43 @@ class MCQMobileApp(MDBoxLayout):
             app_logger.error(f"Results display error: {str(e)}")
             self.results_text.text = f"Error displaying results: {str(e)}"
     
+    def display_progress(self, question, options, update):
+        """Show the provisional answer while result pages are still being read"""
+        progress = f"{update['pages_done']}/{update['pages_total']} pages"
+        self.status_label.text = f"Searching for answer... ({progress})"
+        
+        answers = update["answers"]
+        if answers and answers[0] != "Not found":
+            options_text = "\n".join([f"{k}: {v}" for k, v in options.items()])
+            self.results_text.text = (
+                f"⏳ Question:\n{question[:100]}...\n\nOptions:\n{options_text}\n\n"
+                f"🎯 Likely answer: {', '.join(answers)}\n(Still checking, {progress})"
+            )
+    
+    def display_multi_results(self, questions, answers, confidence):
+        """Display answers for every question found on the page"""
+        try:
+            lines = []
+            found = 0
+            for item in questions:
+                item_answers = answers.get(item["number"], ["Not found"])
+                if "error" in item_answers:
+                    answer_text = "❌ Search error"
+                elif item_answers and item_answers[0] != "Not found":
+                    answer_text = "🎯 " + ", ".join(item_answers)
+                    found += 1
+                else:
+                    answer_text = "🤷 No clear answer"
+                lines.append(f"Q{item['number']}: {item['question'][:40]}...\n{answer_text}")
+            
+            self.results_text.text = "\n\n".join(lines) + f"\n\n(Confidence: {confidence:.1%})"
+            self.status_label.text = "Processing complete!"
+            self.show_snackbar(f"Answered {found} of {len(questions)} questions")
+            
+        except Exception as e:
+            app_logger.error(f"Results display error: {str(e)}")
+            self.results_text.text = f"Error displaying results: {str(e)}"
+    
     def display_error(self, error_msg):
         """Display error message"""
         self.status_label.text = f"Error: {error_msg}"
@@ -324,7 +493,8 @@ class MCQMobileApp(MDBoxLayout):
     
     def processing_complete(self):
         """Clean up after processing"""
-        self.is_processing = False
+        if self.scheduler.is_busy():
+            return
         self.progress_bar.opacity = 0
         self.progress_bar.stop()
     
@@ -341,6 +511,14 @@ class MCQMobileAppClass(MDApp):
         self.theme_cls.primary_palette = "Blue"
         self.title = "MCQ Scanner Mobile"
         return MCQMobileApp()
+    
+    def on_pause(self):
+        # A paused app may be killed without on_stop
+        self.root.journal.flush()
+        return True
+    
+    def on_stop(self):
+        self.root.journal.close()
 
 if __name__ == '__main__':
     try:
@@ -0,0 +1,196 @@
+import re
+from utils.logger import app_logger
+
+# Options are reported as letters, so positions beyond Z are not options
+MAX_OPTIONS = 26
+ROMAN_VALUES = {'i': 1, 'v': 5, 'x': 10}
+
+def roman_index(label):
+    """Zero-based position of a lowercase roman numeral up to xxxix, or None"""
+    total = 0
+    previous = 0
+    for char in reversed(label):
+        value = ROMAN_VALUES.get(char)
+        if value is None:
+            return None
+        if value < previous:
+            total -= value
+        else:
+            total += value
+            previous = value
+    return total - 1 if 0 < total < 40 else None
+
+
+class MCQParser:
+    """Single-pass, table-driven parser for OCR'd multiple choice text.
+
+    Each line is cleaned, classified once and fed to a small state
+    machine (question text -> options -> next question). Option markers
+    may be letters (A) a. (b) B:), numbers (1. 2)) or roman numerals
+    (i. (ii)); every style is mapped onto option letters by position, so
+    "1.", "i." and "A)" all become option A for the rest of the pipeline.
+    """
+
+    # "12.", "Q3)", "Question 4:" at the start of a line
+    QUESTION_START = re.compile(r'^(?:Q(?:uestion)?\s*)?(\d{1,3})\s*[\.\)\:\-]\s*\S', re.IGNORECASE)
+    OPTION_MARKER = re.compile(
+        r'^(?:\(\s*(?P<paren>[A-Za-z]|[ivxIVX]{1,6}|\d{1,2})\s*\)'
+        r'|(?P<label>[ivxIVX]{2,6}|[A-Za-z]|\d{1,2})(?P<delim>[\.\)\:]|\s(?=\S)))'
+        r'\s*(?P<text>.*)$'
+    )
+    ZERO_IN_WORD = re.compile(r'(?<=[A-Za-z])0(?=[A-Za-z])')
+    # Applied in order; each one only if it leaves some text behind
+    QUESTION_HEADERS = [
+        re.compile(r'^\s*\d+[\.\)]\s*'),
+        re.compile(r'^\s*Title\s*', re.IGNORECASE),
+        re.compile(r'^\s*Question\s*\d*[\.\)\:\-]?\s*', re.IGNORECASE),
+        re.compile(r'^\s*MCQ\s*\d*\s*', re.IGNORECASE),
+        re.compile(r'^\s*[Qq]\s*\d*[\.\)\:\-]\s*'),
+    ]
+    OCR_FIXES = str.maketrans({'|': 'I'})
+
+    # Parser states
+    QUESTION = 0
+    OPTIONS = 1
+
+    def clean_line(self, line):
+        """Collapse whitespace and fix common OCR misreads in one line"""
+        line = ' '.join(line.translate(self.OCR_FIXES).split())
+        if '0' in line:
+            # Only a zero inside a word is a misread O; numbers are left alone
+            line = self.ZERO_IN_WORD.sub('O', line)
+        return line
+
+    def clean_text(self, text):
+        return '\n'.join(self.clean_line(line) for line in text.splitlines()).strip()
+
+    def option_candidates(self, match):
+        """Possible (style, position) readings of an option marker"""
+        label = match.group('paren') or match.group('label')
+        if label.isdigit():
+            return [('number', int(label) - 1)]
+
+        # Space-delimited markers are only trusted for capital letters ("A Paris")
+        spaced = match.group('paren') is None and match.group('delim').isspace()
+        candidates = []
+        if len(label) == 1:
+            if spaced and not label.isupper():
+                return candidates
+            candidates.append(('letter', ord(label.upper()) - ord('A')))
+        if not spaced and (len(label) > 1 or label.islower()):
+            position = roman_index(label.lower())
+            if position is not None:
+                candidates.append(('roman', position))
+        return candidates
+
+    def read_option(self, line, style, last_position, has_question):
+        """Return (style, position, text, spaced) if the line continues the option sequence"""
+        match = self.OPTION_MARKER.match(line)
+        if not match:
+            return None
+
+        spaced = match.group('paren') is None and match.group('delim').isspace()
+        for candidate_style, position in self.option_candidates(match):
+            if position >= MAX_OPTIONS:
+                continue
+            if style is None:
+                # The first option needs question text before it and may follow a garbled first marker
+                accepted = has_question and position <= 1
+            else:
+                accepted = candidate_style == style and last_position < position <= last_position + 2
+            if accepted:
+                return candidate_style, position, match.group('text'), spaced
+        return None
+
+    def parse(self, text, split=True):
+        """Parse text into [{"number", "question", "options"}] in one scan.
+
+        With split=False the whole text is read as a single question.
+        """
+        results = []
+        question_lines = []
+        options = []
+        # Lines of an option block whose markers were all "A word" style; a lone
+        # one may turn out to be a wrapped question line starting with "A"
+        spaced_lines = None
+        state = self.QUESTION
+        style = None
+        last_position = -1
+
+        for raw_line in text.splitlines():
+            line = self.clean_line(raw_line)
+            if not line:
+                continue
+
+            if state == self.OPTIONS:
+                option = self.read_option(line, style, last_position, True)
+                if option is None and spaced_lines is not None and len(options) == 1:
+                    restart = self.read_option(line, None, -1, True)
+                    if restart is not None and not restart[3] and restart[1] <= last_position:
+                        # "A)" after a lone "A word" line: that line was question text starting with "A"
+                        question_lines.extend(spaced_lines)
+                        options, spaced_lines = [], None
+                        state, style, last_position = self.QUESTION, None, -1
+
+            if state == self.OPTIONS:
+                # A numbered line or a new question sentence after options starts the next question;
+                # with numbered options only the question mark tells "5. Why...?" from option 5
+                if option is None:
+                    starts_question = line.endswith('?') or self.QUESTION_START.match(line)
+                else:
+                    starts_question = style == 'number' and line.endswith('?')
+                if split and starts_question:
+                    results.append(self.build(question_lines, options, len(results) + 1))
+                    question_lines, options, spaced_lines = [], [], None
+                    state, style, last_position = self.QUESTION, None, -1
+                elif option is not None:
+                    style, last_position, option_text, spaced = option
+                    options.append((last_position, [option_text]))
+                    spaced_lines = spaced_lines + [line] if spaced and spaced_lines is not None else None
+                    continue
+                else:
+                    options[-1][1].append(line)
+                    if spaced_lines is not None:
+                        spaced_lines.append(line)
+                    continue
+
+            option = self.read_option(line, None, -1, bool(question_lines))
+            if option is not None:
+                style, last_position, option_text, spaced = option
+                options.append((last_position, [option_text]))
+                spaced_lines = [line] if spaced else None
+                state = self.OPTIONS
+            else:
+                question_lines.append(line)
+
+        if question_lines or options:
+            results.append(self.build(question_lines, options, len(results) + 1))
+        return results
+
+    def build(self, question_lines, options, index):
+        number_match = self.QUESTION_START.match(question_lines[0]) if question_lines else None
+        return {
+            "number": number_match.group(1) if number_match else str(index),
+            "question": self.clean_question(' '.join(question_lines)),
+            "options": {
+                chr(ord('A') + position): ' '.join(parts).strip()
+                for position, parts in options
+            },
+        }
+
+    def clean_question(self, question):
+        """Remove common header patterns from question"""
+        for pattern in self.QUESTION_HEADERS:
+            cleaned = pattern.sub('', question, count=1)
+            # Only update if we actually removed something and result is not empty
+            if cleaned.strip() and cleaned != question:
+                question = cleaned
+        return question.strip()
+
+    def parse_mcq(self, text):
+        """Parse the whole text as one question; returns (question, options)"""
+        parsed = self.parse(text, split=False)
+        if not parsed:
+            return "", {}
+        app_logger.debug("Extracted question: '%s' with %d options", parsed[0]["question"], len(parsed[0]["options"]))
+        return parsed[0]["question"], parsed[0]["options"]
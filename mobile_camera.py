@@ -1,10 +1,11 @@
 # mobile_camera.py
 from kivy.uix.camera import Camera
 from kivy.clock import Clock
-from kivy.graphics.texture import Texture
-import time
 from utils.logger import app_logger
 from utils.config import MobileConfig
+from capture_scheduler import AdaptiveCaptureScheduler
+from frame_buffer import Frame
+from utils.metrics import metrics
 
 class MobileCameraController:
     def __init__(self):
@@ -13,6 +14,9 @@ class MobileCameraController:
         self.current_frame = None
         self.frame_counter = 0
         self.capture_callback = None
+        self.capture_scheduler = AdaptiveCaptureScheduler()
+        self.is_pipeline_busy = None
+        self.auto_event = None
         
         app_logger.info("MobileCameraController initialized")
     
@@ -34,62 +38,59 @@ class MobileCameraController:
             return False
     
     def capture_frame(self):
-        """Capture current frame as image data"""
+        """Capture current frame without copying the pixel buffer"""
         if not self.is_camera_available or not self.camera.texture:
             return None
         
         try:
             # Get texture data
-            texture = self.camera.texture
-            buffer = texture.pixels
-            return buffer, texture.size
+            with metrics.span("capture_image"):
+                texture = self.camera.texture
+                return Frame(texture.pixels, texture.size)
             
         except Exception as e:
             app_logger.error(f"Frame capture error: {str(e)}")
             return None
     
     def capture_image(self):
-        """Capture image and return as bytes for OCR"""
-        frame_data = self.capture_frame()
-        if frame_data:
-            buffer, size = frame_data
-            # Convert texture to JPEG bytes
-            from PIL import Image
-            import io
-            
-            # Convert buffer to PIL Image
-            image = Image.frombytes('RGBA', size, buffer)
-            # Convert to RGB and then to JPEG bytes
-            rgb_image = image.convert('RGB')
-            
-            img_byte_arr = io.BytesIO()
-            rgb_image.save(img_byte_arr, format='JPEG', quality=85)
-            img_byte_arr.seek(0)
-            
+        """Capture image for OCR; encoding is left to the OCR backend"""
+        frame = self.capture_frame()
+        if frame:
             app_logger.info("Image captured successfully")
-            return img_byte_arr.getvalue()
-        
-        return None
+        return frame
     
     def set_capture_callback(self, callback):
         """Set callback for auto-capture mode"""
         self.capture_callback = callback
     
-    def start_auto_capture(self):
-        """Start automatic capture at intervals"""
+    def start_auto_capture(self, is_pipeline_busy=None):
+        """Start adaptive automatic capture"""
         if self.capture_callback:
-            Clock.schedule_interval(self.auto_capture, MobileConfig.AUTO_CAPTURE_INTERVAL)
+            self.stop_auto_capture()
+            self.is_pipeline_busy = is_pipeline_busy
+            self.capture_scheduler.reset()
+            self.auto_event = Clock.schedule_once(self.auto_capture, self.capture_scheduler.poll_interval)
     
     def stop_auto_capture(self):
         """Stop automatic capture"""
-        Clock.unschedule(self.auto_capture)
+        if self.auto_event is not None:
+            self.auto_event.cancel()
+            self.auto_event = None
     
     def auto_capture(self, dt):
-        """Auto-capture callback"""
-        if self.capture_callback:
-            image_data = self.capture_image()
-            if image_data:
-                self.capture_callback(image_data)
+        """Auto-capture poll; reschedules itself at the scheduler's current interval"""
+        if not self.capture_callback or self.auto_event is None:
+            return
+        
+        frame = self.capture_frame()
+        if frame:
+            self.frame_counter += 1
+            busy = bool(self.is_pipeline_busy and self.is_pipeline_busy())
+            # Only steady frames of a new page are sent; encoding happens on the scan workers
+            if self.capture_scheduler.should_capture(frame, busy):
+                self.capture_callback(frame)
+        
+        self.auto_event = Clock.schedule_once(self.auto_capture, self.capture_scheduler.poll_interval)
     
     def stop_camera(self):
         """Stop camera and cleanup"""
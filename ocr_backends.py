@@ -0,0 +1,175 @@
+import io
+import threading
+from utils.logger import app_logger
+from utils.config import MobileConfig
+from utils.http_client import get_http_client
+from frame_buffer import Frame
+
+class OCRBackend:
+    """Base class for OCR engines returning (text, confidence)"""
+    name = "base"
+
+    def prepare_input(self, image_data):
+        """Convert a Frame or encoded image into what the engine consumes"""
+        raise NotImplementedError
+
+    def extract_text(self, image_data):
+        """Return extracted text and a 0-1 confidence"""
+        raise NotImplementedError
+
+    def warm_up(self):
+        """Load anything expensive ahead of the first scan"""
+        pass
+
+
+class OCRSpaceBackend(OCRBackend):
+    """OCR.Space web API"""
+    name = "ocr_space"
+
+    def __init__(self, api_key=None):
+        self.api_key = api_key or MobileConfig.OCR_SPACE_API_KEY
+        self.api_url = "https://api.ocr.space/parse/image"
+
+    def prepare_input(self, image_data):
+        """Return (file object, file type) ready for upload"""
+        if isinstance(image_data, Frame):
+            if image_data.channels == 1:
+                # Preprocessed frames are bilevel and compress best as PNG
+                return image_data.encode('PNG'), 'PNG'
+            return image_data.encode('JPEG'), 'JPG'
+        if hasattr(image_data, 'read'):  # File object
+            return image_data, 'JPG'
+        return io.BytesIO(image_data), 'JPG'  # Assume it's image bytes
+
+    def extract_text(self, image_data):
+        # Upload as multipart file to avoid base64 inflation
+        image_file, file_type = self.prepare_input(image_data)
+
+        payload = {
+            'apikey': self.api_key,
+            'language': 'eng',
+            'isOverlayRequired': False,
+            'filetype': file_type,
+            'OCREngine': 2  # Engine 2 is more accurate
+        }
+
+        response = get_http_client().post(
+            self.api_url,
+            data=payload,
+            files={'file': (f"frame.{file_type.lower()}", image_file)},
+            timeout=30
+        )
+        result = response.json()
+
+        if result.get('IsErroredOnProcessing'):
+            error_msg = result.get('ErrorMessage', 'Unknown OCR error')
+            app_logger.error(f"OCR API error: {error_msg}")
+            return "", 0.0
+
+        # Extract text and confidence
+        parsed_results = result.get('ParsedResults', [])
+        if parsed_results:
+            text = parsed_results[0].get('ParsedText', '')
+            confidence = float(parsed_results[0].get('TextOverlay', {}).get('MedianConfidence', 50))
+            app_logger.info(f"OCR extracted text with confidence: {confidence}")
+            return text, confidence / 100.0  # Convert to 0-1 scale
+
+        return "", 0.0
+
+
+class LocalOCRBackend(OCRBackend):
+    """On-device EasyOCR engine running on CPU"""
+    name = "local"
+
+    # The model is shared by every instance and loaded only once
+    _reader = None
+    _reader_lock = threading.Lock()
+
+    def __init__(self, languages=None):
+        self.languages = languages or MobileConfig.LOCAL_OCR_LANGUAGES
+
+    def get_reader(self):
+        """Load the EasyOCR model on first use and keep it warm"""
+        if LocalOCRBackend._reader is None:
+            with LocalOCRBackend._reader_lock:
+                if LocalOCRBackend._reader is None:
+                    import easyocr
+                    app_logger.info("Loading local OCR model")
+                    LocalOCRBackend._reader = easyocr.Reader(
+                        self.languages, gpu=False, verbose=False
+                    )
+                    app_logger.info("Local OCR model loaded")
+        return LocalOCRBackend._reader
+
+    def warm_up(self):
+        self.get_reader()
+
+    def prepare_input(self, image_data):
+        """Return a grayscale array, decoding only if given encoded bytes"""
+        if isinstance(image_data, Frame):
+            return image_data.gray()
+
+        import cv2
+        import numpy as np
+
+        if hasattr(image_data, 'read'):  # File object
+            image_data = image_data.read()
+        buffer = np.frombuffer(image_data, dtype=np.uint8)
+        return cv2.imdecode(buffer, cv2.IMREAD_GRAYSCALE)
+
+    def extract_text(self, image_data):
+        image = self.prepare_input(image_data)
+        if image is None:
+            app_logger.error("Local OCR could not decode image")
+            return "", 0.0
+
+        results = self.get_reader().readtext(image, detail=1, paragraph=False)
+        if not results:
+            return "", 0.0
+
+        text = self.join_lines(results)
+        confidence = sum(result[2] for result in results) / len(results)
+        app_logger.info(f"Local OCR extracted text with confidence: {confidence:.2f}")
+        return text, float(confidence)
+
+    def join_lines(self, results):
+        """Group detected boxes into text lines in reading order"""
+        boxes = []
+        for box, text, _ in results:
+            ys = [point[1] for point in box]
+            xs = [point[0] for point in box]
+            boxes.append((min(ys), max(ys), min(xs), text))
+        boxes.sort()
+
+        lines = []
+        current = []
+        line_bottom = None
+        for top, bottom, left, text in boxes:
+            # A box starting above the middle of the current line belongs to it
+            if current and top > (current[0][0] + line_bottom) / 2:
+                lines.append(current)
+                current = []
+            if not current:
+                line_bottom = bottom
+            current.append((top, left, text))
+            line_bottom = max(line_bottom, bottom)
+        if current:
+            lines.append(current)
+
+        return '\n'.join(
+            ' '.join(text for _, _, text in sorted(line, key=lambda item: item[1]))
+            for line in lines
+        )
+
+
+OCR_BACKENDS = {
+    OCRSpaceBackend.name: OCRSpaceBackend,
+    LocalOCRBackend.name: LocalOCRBackend,
+}
+
+def create_ocr_backend(name=None):
+    """Create the OCR backend selected in config"""
+    name = name or MobileConfig.OCR_BACKEND
+    if name not in OCR_BACKENDS:
+        raise ValueError(f"Unknown OCR backend: {name}")
+    return OCR_BACKENDS[name]()
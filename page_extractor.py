@@ -0,0 +1,84 @@
+import codecs
+from html.parser import HTMLParser
+from utils.config import MobileConfig
+
+class PageTextExtractor(HTMLParser):
+    """Incremental HTML to text converter that skips non-content subtrees"""
+
+    SKIP_TAGS = {'script', 'style', 'noscript', 'template', 'svg'}
+    BLOCK_TAGS = {
+        'p', 'div', 'br', 'li', 'ul', 'ol', 'tr', 'td', 'th', 'table',
+        'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'section', 'article',
+        'summary', 'details', 'blockquote', 'pre', 'dd', 'dt', 'title',
+    }
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.chunks = []
+        self.skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIP_TAGS:
+            self.skip_depth += 1
+        elif tag in self.BLOCK_TAGS and not self.skip_depth:
+            self.chunks.append('\n')
+
+    def handle_endtag(self, tag):
+        if tag in self.SKIP_TAGS:
+            self.skip_depth = max(0, self.skip_depth - 1)
+        elif tag in self.BLOCK_TAGS and not self.skip_depth:
+            self.chunks.append('\n')
+
+    def handle_data(self, data):
+        if not self.skip_depth:
+            self.chunks.append(data)
+
+    def take_text(self):
+        """Return text collected since the last call"""
+        text = ''.join(self.chunks)
+        self.chunks = []
+        return text
+
+
+def extract_text_streaming(chunks, charset='utf-8', stop_marker=None, max_bytes=None, cancel=None):
+    """Stream response chunks into text, stopping at the byte cap, once
+    the stop marker has been seen and enough text after it was collected,
+    or as soon as the optional cancel event is set."""
+    max_bytes = max_bytes or MobileConfig.PAGE_MAX_BYTES
+    tail_chars = MobileConfig.ANSWER_WINDOW_AFTER
+    stop_marker = stop_marker.lower() if stop_marker else None
+
+    decoder = codecs.getincrementaldecoder(charset)(errors='replace')
+    parser = PageTextExtractor()
+    parts = []
+    text_length = 0
+    marker_end = None
+    recent = ''
+    received = 0
+
+    for chunk in chunks:
+        if cancel is not None and cancel.is_set():
+            break
+        received += len(chunk)
+        parser.feed(decoder.decode(chunk))
+        new_text = parser.take_text()
+        if new_text:
+            if stop_marker and marker_end is None:
+                # Search only the new text plus an overlap for markers split across chunks
+                window = recent + new_text
+                position = window.lower().find(stop_marker)
+                if position != -1:
+                    marker_end = text_length - len(recent) + position + len(stop_marker)
+                recent = window[-len(stop_marker):]
+            parts.append(new_text)
+            text_length += len(new_text)
+
+        if marker_end is not None and text_length - marker_end >= tail_chars:
+            break
+        if received >= max_bytes:
+            break
+
+    parser.feed(decoder.decode(b'', final=True))
+    parser.close()
+    parts.append(parser.take_text())
+    return ''.join(parts)
@@ -0,0 +1,279 @@
+"""Local question bank for answering known questions without going online.
+
+Questions are stored in SQLite with a character trigram index, so a
+lookup tolerates the odd OCR error. Import a bank with:
+
+    python question_bank.py import questions.csv
+    python question_bank.py import questions.jsonl
+"""
+import argparse
+import csv
+import json
+import math
+import os
+import sqlite3
+import threading
+import time
+from utils.logger import app_logger
+from utils.config import MobileConfig
+from utils.cache import AnswerCache
+
+def trigrams(text):
+    """Character trigrams of normalized text, padded at word edges"""
+    normalized = AnswerCache.normalize(text)
+    if not normalized:
+        return set()
+    padded = f" {normalized} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+# Words that flip a question's meaning while barely changing its trigrams
+NEGATION_WORDS = frozenset(["not", "no", "never", "except", "incorrect", "false", "least", "untrue", "wrong"])
+
+def negations(text):
+    return NEGATION_WORDS.intersection(AnswerCache.normalize(text).split())
+
+
+def similarity(grams_a, grams_b):
+    """Jaccard similarity of two trigram sets"""
+    if not grams_a or not grams_b:
+        return 0.0
+    shared = len(grams_a & grams_b)
+    return shared / (len(grams_a) + len(grams_b) - shared)
+
+
+class QuestionBank:
+    """SQLite question bank with a trigram inverted index for fuzzy lookup"""
+
+    def __init__(self, db_path=None):
+        self.db_path = db_path or MobileConfig.QUESTION_BANK_PATH
+        self.lock = threading.Lock()
+
+        bank_dir = os.path.dirname(self.db_path)
+        if bank_dir:
+            os.makedirs(bank_dir, exist_ok=True)
+
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        # Let SQLite read the index through a memory map instead of read() calls
+        self.conn.execute(f"PRAGMA mmap_size = {MobileConfig.QUESTION_BANK_MMAP_BYTES}")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS questions ("
+            "id INTEGER PRIMARY KEY, "
+            "fingerprint TEXT UNIQUE NOT NULL, "
+            "question TEXT NOT NULL, "
+            "options TEXT NOT NULL, "
+            "answers TEXT NOT NULL, "
+            "gram_count INTEGER NOT NULL, "
+            "source TEXT, "
+            "added REAL NOT NULL)"
+        )
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS grams ("
+            "gram TEXT NOT NULL, "
+            "question_id INTEGER NOT NULL)"
+        )
+        # Covering index: posting lists are read from the index alone
+        self.conn.execute("DROP INDEX IF EXISTS grams_gram")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS grams_gram_question ON grams (gram, question_id)")
+        # Posting list lengths, so lookups can probe the rarest grams only
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS gram_counts ("
+            "gram TEXT PRIMARY KEY, "
+            "count INTEGER NOT NULL) WITHOUT ROWID"
+        )
+        if self.conn.execute("SELECT 1 FROM gram_counts LIMIT 1").fetchone() is None:
+            self.conn.execute("INSERT INTO gram_counts SELECT gram, COUNT(*) FROM grams GROUP BY gram")
+        self.conn.commit()
+
+    def count(self):
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM questions").fetchone()[0]
+
+    def add(self, question, options, answers, source="import", commit=True):
+        """Add or update a question; answers are option letters"""
+        answers = [answer for answer in answers if answer in options]
+        if not question or not answers:
+            return False
+
+        # Store the answer texts too, so lookups can remap letters if options are reordered
+        record = {
+            "letters": answers,
+            "texts": [options[answer] for answer in answers],
+        }
+        grams = trigrams(question)
+        fingerprint = AnswerCache.fingerprint(question, options)
+
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT id FROM questions WHERE fingerprint = ?", (fingerprint,)
+            ).fetchone()
+            if row:
+                self.conn.execute(
+                    "UPDATE questions SET answers = ?, source = ?, added = ? WHERE id = ?",
+                    (json.dumps(record), source, time.time(), row[0])
+                )
+            else:
+                cursor = self.conn.execute(
+                    "INSERT INTO questions (fingerprint, question, options, answers, gram_count, source, added) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (fingerprint, question, json.dumps(options), json.dumps(record),
+                     len(grams), source, time.time())
+                )
+                self.conn.executemany(
+                    "INSERT INTO grams (gram, question_id) VALUES (?, ?)",
+                    [(gram, cursor.lastrowid) for gram in grams]
+                )
+                self.conn.executemany(
+                    "INSERT INTO gram_counts (gram, count) VALUES (?, 1) "
+                    "ON CONFLICT (gram) DO UPDATE SET count = count + 1",
+                    [(gram,) for gram in grams]
+                )
+            if commit:
+                self.conn.commit()
+        return True
+
+    def lookup(self, question, options):
+        """Return answer letters for the closest known question, or None"""
+        grams = trigrams(question)
+        if not grams:
+            return None
+
+        with self.lock:
+            probe = self.probe_grams(grams)
+            if not probe:
+                return None
+            placeholders = ','.join('?' * len(probe))
+            candidates = self.conn.execute(
+                f"SELECT q.question, q.options, q.answers "
+                f"FROM grams g JOIN questions q ON q.id = g.question_id "
+                f"WHERE g.gram IN ({placeholders}) "
+                f"AND (q.source IS NOT 'web' OR q.added >= ?) "
+                f"GROUP BY g.question_id ORDER BY COUNT(*) DESC LIMIT ?",
+                # Answers learned from the web expire so they get re-checked online
+                (*probe, time.time() - MobileConfig.QUESTION_BANK_WEB_TTL, MobileConfig.QUESTION_BANK_CANDIDATES)
+            ).fetchall()
+
+        scored = sorted(
+            ((similarity(grams, trigrams(bank_question)), bank_question, bank_options, bank_answers)
+             for bank_question, bank_options, bank_answers in candidates),
+            reverse=True
+        )
+        question_negations = negations(question)
+        for score, bank_question, bank_options, bank_answers in scored:
+            if score < MobileConfig.QUESTION_BANK_MIN_SIMILARITY:
+                break
+            # A reused stem with "NOT", or other options, is a different question
+            if negations(bank_question) != question_negations:
+                continue
+            if not self.options_match(json.loads(bank_options), options):
+                continue
+
+            answers = self.map_answers(json.loads(bank_answers), options)
+            if answers:
+                app_logger.info(f"Question bank match ({score:.2f}): {bank_question[:50]}")
+            return answers
+
+        return None
+
+    def probe_grams(self, grams):
+        """The rarest grams any question similar enough to match must share.
+
+        A match needs QUESTION_BANK_MIN_SIMILARITY of the query's grams, so
+        it contains at least one of the rarest len - ceil(min * len) + 1.
+        Common grams such as " th" never have their posting lists read.
+        """
+        placeholders = ','.join('?' * len(grams))
+        counts = dict(self.conn.execute(
+            f"SELECT gram, count FROM gram_counts WHERE gram IN ({placeholders})", tuple(grams)
+        ).fetchall())
+        needed = math.ceil(MobileConfig.QUESTION_BANK_MIN_SIMILARITY * len(grams))
+        rarest = sorted(grams, key=lambda gram: counts.get(gram, 0))[:len(grams) - needed + 1]
+        # Grams no stored question has cannot produce candidates
+        return [gram for gram in rarest if gram in counts]
+
+    def options_match(self, bank_options, options):
+        """True if both questions offer the same option texts, in any order"""
+        if len(bank_options) != len(options):
+            return False
+        remaining = {letter: trigrams(text) for letter, text in options.items()}
+        for text in bank_options.values():
+            grams = trigrams(text)
+            scored = [(similarity(grams, option_grams), letter) for letter, option_grams in remaining.items()]
+            score, letter = max(scored)
+            if score < MobileConfig.QUESTION_BANK_OPTION_SIMILARITY:
+                return False
+            del remaining[letter]
+        return True
+
+    def map_answers(self, record, options):
+        """Translate stored answers onto the scanned question's option letters"""
+        answers = []
+        option_grams = {letter: trigrams(text) for letter, text in options.items()}
+        for letter, text in zip(record["letters"], record["texts"]):
+            answer_grams = trigrams(text)
+            scored = [(similarity(answer_grams, grams), option) for option, grams in option_grams.items()]
+            score, option = max(scored) if scored else (0.0, None)
+            if score >= MobileConfig.QUESTION_BANK_OPTION_SIMILARITY:
+                answers.append(option)
+            elif not answer_grams and letter in options:
+                answers.append(letter)
+
+        return sorted(set(answers)) or None
+
+    def import_file(self, path):
+        """Import questions from CSV (question, A-D or options, answer) or JSONL"""
+        added = 0
+        for item in self.read_records(path):
+            answers = item.get("answers") or item.get("answer") or []
+            if isinstance(answers, str):
+                answers = [answer.strip().upper() for answer in answers.replace(';', ',').split(',') if answer.strip()]
+            if self.add(item.get("question", "").strip(), item["options"], answers, source=os.path.basename(path), commit=False):
+                added += 1
+
+        with self.lock:
+            self.conn.commit()
+        app_logger.info(f"Imported {added} questions from {path}")
+        return added
+
+    def read_records(self, path):
+        if path.lower().endswith(('.jsonl', '.json')):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
+        else:
+            with open(path, newline='', encoding="utf-8") as f:
+                for row in csv.DictReader(f):
+                    if "options" in row and row["options"]:
+                        row["options"] = json.loads(row["options"])
+                    else:
+                        row["options"] = {
+                            letter: row[letter] for letter in "ABCDEFGH"
+                            if row.get(letter)
+                        }
+                    yield row
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the local question bank")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    import_parser = subparsers.add_parser("import", help="import a CSV or JSONL file")
+    import_parser.add_argument("path")
+    subparsers.add_parser("count", help="print the number of stored questions")
+    args = parser.parse_args()
+
+    bank = QuestionBank()
+    if args.command == "import":
+        added = bank.import_file(args.path)
+        print(f"Imported {added} questions ({bank.count()} total)")
+    else:
+        print(bank.count())
+    bank.close()
+
+
+if __name__ == "__main__":
+    main()
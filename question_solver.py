@@ -1,58 +1,179 @@
 # question_solver.py
-from googlesearch import search
-import requests
-from bs4 import BeautifulSoup
-import re
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from utils.logger import app_logger
 from utils.config import MobileConfig
+from utils.cache import AnswerCache
+from utils.metrics import metrics
+from utils.http_client import get_http_client
+from utils.single_flight import SingleFlight
+from answer_matcher import AnswerMatcher
+from page_extractor import extract_text_streaming
+from question_bank import QuestionBank
+from search_providers import SearchRouter
 
 class QuestionSolver:
-    def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Linux; Android 10; Mobile) AppleWebKit/537.36'
-        })
+    def __init__(self, cache=None, http_client=None, question_bank=None, search_router=None):
+        self.cache = cache if cache is not None else AnswerCache()
+        self.question_bank = question_bank if question_bank is not None else QuestionBank()
+        self.http = http_client or get_http_client()
+        self.session = self.http.session
+        self.search_router = search_router or SearchRouter()
+        # Concurrent scans of the same question wait for one search
+        self.search_flights = SingleFlight()
     
     def search_question(self, question, options):
         """Search question online and find answers"""
+        result = {"answers": ["Not found"]}
+        for result in self.iter_search(question, options):
+            pass
+        if "error" in result:
+            return {"error": result["error"]}
+        return result["answers"]
+    
+    def iter_search(self, question, options):
+        """Yield provisional answer updates for a question; the last one has final=True.
+        
+        Closing the generator early stops page fetches that are still running.
+        """
+        cached_answers = self.cache.get(question, options)
+        if cached_answers is not None:
+            app_logger.info("Answer served from cache")
+            yield self.progress_update(cached_answers, final=True)
+            return
+        
+        # Known questions are answered offline
+        bank_answers = self.question_bank.lookup(question, options)
+        if bank_answers:
+            app_logger.info("Answer served from question bank")
+            self.cache.put(question, options, bank_answers)
+            yield self.progress_update(bank_answers, final=True)
+            return
+        
+        key = AnswerCache.fingerprint(question, options)
+        flight, leader = self.search_flights.claim(key)
+        if not leader:
+            app_logger.info("Waiting for in-flight search of the same question")
+            result = flight.result()
+            if result is None:
+                # The other scan gave up before finishing; search again
+                yield from self.iter_search(question, options)
+            else:
+                yield result
+            return
+        
         search_query = f'"{question}"'
         
         try:
-            # Get search results
-            search_results = list(search(
-                search_query, 
-                num_results=MobileConfig.MAX_SEARCH_RESULTS,
-                timeout=MobileConfig.SEARCH_TIMEOUT
-            ))
+            # Get search results from the fastest healthy provider
+            search_results = self.search_router.search(search_query)
             
-            # Analyze each result
-            answers = self.analyze_results(search_results, question, options)
-            return answers
+            # Analyze each result, reporting after every page
+            for update in self.iter_results(search_results, question, options):
+                if update["final"]:
+                    answers = update["answers"]
+                    self.cache.put(question, options, answers)
+                    if update["confirmed"] and len(answers) == 1:
+                        # Only a clear web majority is kept offline; rough tallies stay in the short-lived cache
+                        self.question_bank.add(question, options, answers, source="web")
+                    # Release waiting scans before our own consumer sees the result
+                    self.search_flights.resolve(key, flight, update)
+                yield update
             
         except Exception as e:
             app_logger.error(f"Search error: {str(e)}")
-            return {"error": str(e)}
+            error = {"error": str(e), "final": True}
+            if not flight.done():
+                self.search_flights.resolve(key, flight, error)
+            yield error
+        finally:
+            if not flight.done():
+                self.search_flights.resolve(key, flight)
+    
+    def solve_questions(self, questions):
+        """Search several parsed questions concurrently, keyed by question number"""
+        results = {}
+        if not questions:
+            return results
+        
+        with ThreadPoolExecutor(max_workers=min(MobileConfig.MAX_PARALLEL_QUESTIONS, len(questions))) as executor:
+            futures = {
+                executor.submit(metrics.propagate(self.search_question), item["question"], item["options"]): item["number"]
+                for item in questions
+            }
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+        
+        return results
     
     def analyze_results(self, urls, question, options):
         """Analyze search results to find correct answers"""
+        answers = ["Not found"]
+        for update in self.iter_results(urls, question, options):
+            answers = update["answers"]
+        return answers
+    
+    def iter_results(self, urls, question, options):
+        """Yield the provisional answer distribution after each analyzed page"""
         answer_counts = {option: 0 for option in options.keys()}
         total_matches = 0
         
-        for url in urls:
-            try:
-                page_content = self.extract_page_content(url)
-                page_answers = self.find_answers_in_content(page_content, question, options)
+        if not urls:
+            yield self.progress_update(["Not found"], final=True)
+            return
+        
+        # Compile the answer patterns once for every page
+        matcher = AnswerMatcher(question, options)
+        # Set once the vote is decided; running downloads stop at their next chunk
+        cancel = threading.Event()
+        
+        # Fetch and analyze all pages in parallel
+        executor = ThreadPoolExecutor(
+            max_workers=min(MobileConfig.MAX_FETCH_WORKERS, len(urls))
+        )
+        try:
+            analyze_page = metrics.propagate(self.analyze_page)
+            futures = {
+                executor.submit(analyze_page, url, question, options, matcher, cancel): url
+                for url in urls
+            }
+            
+            pages_done = 0
+            for future in as_completed(futures):
+                url = futures[future]
+                pages_done += 1
+                try:
+                    page_answers = future.result()
+                except Exception as e:
+                    app_logger.warning(f"Failed to analyze {url}: {str(e)}")
+                    page_answers = []
                 
                 for answer in page_answers:
                     if answer in answer_counts:
                         answer_counts[answer] += 1
                         total_matches += 1
-                        
-            except Exception as e:
-                app_logger.warning(f"Failed to analyze {url}: {str(e)}")
-                continue
-        
-        # Return answers with confidence
+                
+                clear_winner = self.has_clear_winner(answer_counts, total_matches)
+                if clear_winner:
+                    app_logger.info("Clear answer found, cancelling remaining page fetches")
+                
+                yield self.progress_update(
+                    self.confident_answers(answer_counts, total_matches),
+                    final=clear_winner or pages_done == len(urls),
+                    confirmed=clear_winner,
+                    votes=dict(answer_counts),
+                    pages_done=pages_done,
+                    pages_total=len(urls)
+                )
+                if clear_winner:
+                    break
+        finally:
+            # Runs on a clear winner and when the caller closes the generator early
+            cancel.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    def confident_answers(self, answer_counts, total_matches):
+        """Options holding a meaningful share of the votes"""
         if total_matches > 0:
             confident_answers = [
                 option for option, count in answer_counts.items() 
@@ -62,41 +183,42 @@ class QuestionSolver:
         
         return ["Not found"]
     
-    def extract_page_content(self, url):
-        """Extract main content from webpage"""
-        response = self.session.get(url, timeout=10)
-        soup = BeautifulSoup(response.content, 'html.parser')
+    def progress_update(self, answers, final, votes=None, pages_done=0, pages_total=0, confirmed=False):
+        return {
+            "answers": answers,
+            "final": final,
+            "confirmed": confirmed,
+            "votes": votes or {},
+            "pages_done": pages_done,
+            "pages_total": pages_total,
+        }
+    
+    def analyze_page(self, url, question, options, matcher=None, cancel=None):
+        """Fetch a single result page and find answers in it"""
+        if cancel is not None and cancel.is_set():
+            return []
+        page_content = self.extract_page_content(url, matcher, cancel)
+        return self.find_answers_in_content(page_content, question, options, matcher)
+    
+    def has_clear_winner(self, answer_counts, total_matches):
+        """Check if one option already dominates the vote"""
+        if total_matches == 0:
+            return False
         
-        # Remove script and style elements
-        for script in soup(["script", "style"]):
-            script.decompose()
-            
-        return soup.get_text()
+        top_count = max(answer_counts.values())
+        return (top_count >= MobileConfig.EARLY_STOP_MIN_VOTES and
+                top_count / total_matches >= MobileConfig.EARLY_STOP_RATIO)
+    
+    def extract_page_content(self, url, matcher=None, cancel=None):
+        """Extract main content from webpage"""
+        with metrics.span("extract_page_content"):
+            # Stream the page and stop once the question and its answer area have been read
+            stop_marker = matcher.question_keywords if matcher else None
+            with self.http.stream_page(url, timeout=MobileConfig.PAGE_FETCH_TIMEOUT, cancel=cancel) as (chunks, charset):
+                return extract_text_streaming(chunks, charset, stop_marker, cancel=cancel)
     
-    def find_answers_in_content(self, content, question, options):
+    def find_answers_in_content(self, content, question, options, matcher=None):
         """Find answers in text content"""
-        found_answers = []
-        content_lower = content.lower()
-        question_keywords = ' '.join(question.lower().split()[:10])  # First 10 words
-        
-        # Look for answer patterns
-        for option, option_text in options.items():
-            option_lower = option_text.lower()
-            
-            # Check if option appears near question keywords
-            if (question_keywords in content_lower and 
-                option_lower in content_lower):
-                found_answers.append(option)
-            
-            # Look for "Answer: A" patterns
-            answer_patterns = [
-                f'answer[:\s]+{option}',
-                f'correct[:\s]+{option}',
-                f'{option}[\.\s]+.*?correct',
-            ]
-            
-            for pattern in answer_patterns:
-                if re.search(pattern, content_lower, re.IGNORECASE):
-                    found_answers.append(option)
-        
-        return found_answers
\ No newline at end of file
+        if matcher is None:
+            matcher = AnswerMatcher(question, options)
+        return matcher.find_answers(content)
@@ -0,0 +1,117 @@
+import threading
+import itertools
+import time
+from collections import deque
+from utils.logger import app_logger
+from utils.config import MobileConfig
+
+class ScanJob:
+    """A captured frame waiting to go through the pipeline"""
+    _ids = itertools.count(1)
+
+    def __init__(self, image_data, source):
+        self.job_id = next(self._ids)
+        self.image_data = image_data
+        self.source = source
+        self.created = time.perf_counter()
+        self.cancelled = threading.Event()
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def is_cancelled(self):
+        return self.cancelled.is_set()
+
+
+class ScanScheduler:
+    """Bounded scan queue served by a fixed pool of worker threads.
+
+    A new capture replaces any pending capture from the same source and
+    marks the one already running from that source as obsolete, so the
+    newest frame always wins.
+    """
+
+    def __init__(self, handler, on_idle=None, max_queue_size=None, workers=None):
+        self.handler = handler
+        self.on_idle = on_idle
+        self.max_queue_size = max_queue_size or MobileConfig.MAX_QUEUE_SIZE
+        self.pending = deque()
+        self.running = {}
+        self.condition = threading.Condition()
+        self.stopped = False
+
+        self.workers = []
+        for index in range(workers or MobileConfig.PROCESSING_WORKERS):
+            worker = threading.Thread(target=self.worker_loop, name=f"scan-worker-{index}")
+            worker.daemon = True
+            worker.start()
+            self.workers.append(worker)
+
+        app_logger.info(f"Scan scheduler started with {len(self.workers)} workers")
+
+    def submit(self, image_data, source=MobileConfig.MANUAL_MODE):
+        """Queue a frame, replacing stale work from the same source"""
+        job = ScanJob(image_data, source)
+
+        with self.condition:
+            stale = [pending for pending in self.pending if pending.source == source]
+            for pending in stale:
+                self.pending.remove(pending)
+                pending.cancel()
+
+            for running in self.running.values():
+                if running.source == source:
+                    running.cancel()
+
+            if len(self.pending) >= self.max_queue_size:
+                dropped = self.pending.popleft()
+                dropped.cancel()
+                app_logger.warning(f"Scan queue full, dropped job {dropped.job_id}")
+
+            self.pending.append(job)
+            self.condition.notify()
+
+        if stale:
+            app_logger.info(f"Job {job.job_id} replaced {len(stale)} pending {source} job(s)")
+        return job
+
+    def is_busy(self):
+        with self.condition:
+            return bool(self.pending or self.running)
+
+    def worker_loop(self):
+        while True:
+            with self.condition:
+                while not self.pending and not self.stopped:
+                    self.condition.wait()
+                if self.stopped:
+                    return
+                job = self.pending.popleft()
+                self.running[job.job_id] = job
+
+            try:
+                if not job.is_cancelled():
+                    self.handler(job)
+            except Exception as e:
+                app_logger.error(f"Scan job {job.job_id} failed: {str(e)}")
+            finally:
+                with self.condition:
+                    del self.running[job.job_id]
+                    idle = not self.pending and not self.running
+                if idle and self.on_idle:
+                    self.on_idle()
+
+    def cancel_all(self):
+        """Drop pending jobs and mark running ones as obsolete"""
+        with self.condition:
+            for job in self.pending:
+                job.cancel()
+            self.pending.clear()
+            for job in self.running.values():
+                job.cancel()
+
+    def shutdown(self):
+        self.cancel_all()
+        with self.condition:
+            self.stopped = True
+            self.condition.notify_all()
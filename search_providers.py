@@ -0,0 +1,201 @@
+import re
+import threading
+import time
+from concurrent.futures import Future, FIRST_COMPLETED, wait
+from urllib.parse import parse_qs, urlparse
+from utils.logger import app_logger
+from utils.config import MobileConfig
+from utils.metrics import metrics
+from utils.http_client import get_http_client
+
+class SearchProvider:
+    """Base class for web search engines returning result URLs"""
+    name = "base"
+
+    def search(self, query, num_results, timeout):
+        raise NotImplementedError
+
+
+class GoogleSearchProvider(SearchProvider):
+    name = "google"
+
+    def search(self, query, num_results, timeout):
+        from googlesearch import search
+        return list(search(query, num_results=num_results, timeout=timeout))
+
+
+class DuckDuckGoProvider(SearchProvider):
+    """DuckDuckGo's JavaScript-free HTML results page"""
+    name = "duckduckgo"
+    url = "https://html.duckduckgo.com/html/"
+    link_pattern = re.compile(r'<a[^>]*class="result__a"[^>]*>', re.IGNORECASE)
+    href_pattern = re.compile(r'href="([^"]+)"', re.IGNORECASE)
+
+    def search(self, query, num_results, timeout):
+        response = get_http_client().post(self.url, data={'q': query}, timeout=timeout)
+        response.raise_for_status()
+
+        urls = []
+        for tag in self.link_pattern.findall(response.text):
+            href = self.href_pattern.search(tag)
+            if not href:
+                continue
+            url = self.resolve(href.group(1).replace('&amp;', '&'))
+            if url and url not in urls:
+                urls.append(url)
+            if len(urls) >= num_results:
+                break
+        return urls
+
+    def resolve(self, href):
+        """Unwrap DuckDuckGo redirect links to the target URL"""
+        if href.startswith('//'):
+            href = 'https:' + href
+        parsed = urlparse(href)
+        if parsed.netloc.endswith('duckduckgo.com'):
+            target = parse_qs(parsed.query).get('uddg')
+            return target[0] if target else None
+        return href if parsed.scheme in ('http', 'https') else None
+
+
+class ProviderStats:
+    """Smoothed latency and error rate for one provider"""
+
+    def __init__(self):
+        self.latency = None
+        self.error_rate = 0.0
+        self.calls = 0
+
+    def update(self, duration, failed):
+        alpha = MobileConfig.SEARCH_STATS_ALPHA
+        self.calls += 1
+        self.latency = duration if self.latency is None else (1 - alpha) * self.latency + alpha * duration
+        self.error_rate = (1 - alpha) * self.error_rate + alpha * (1.0 if failed else 0.0)
+
+    def cost(self):
+        """Lower is better; untried providers get explored first"""
+        latency = self.latency or 0.0
+        return latency * (1 + MobileConfig.SEARCH_ERROR_PENALTY * self.error_rate) + self.error_rate
+
+
+SEARCH_PROVIDERS = {
+    GoogleSearchProvider.name: GoogleSearchProvider,
+    DuckDuckGoProvider.name: DuckDuckGoProvider,
+}
+
+def create_search_providers(names=None):
+    """Create the search providers selected in config, in fallback order"""
+    names = names or MobileConfig.SEARCH_PROVIDERS
+    unknown = [name for name in names if name not in SEARCH_PROVIDERS]
+    if unknown:
+        raise ValueError(f"Unknown search provider: {', '.join(unknown)}")
+    return [SEARCH_PROVIDERS[name]() for name in names]
+
+
+class SearchRouter:
+    """Hedged search across providers, preferring the fastest healthy one.
+
+    The best-ranked provider starts first. If it has not answered within
+    SEARCH_HEDGE_DELAY, or fails, the next one starts as well, and the
+    first non-empty result list wins.
+    """
+
+    def __init__(self, providers=None):
+        if providers is None:
+            providers = create_search_providers()
+        self.providers = providers
+        self.stats = {provider.name: ProviderStats() for provider in providers}
+        self.lock = threading.Lock()
+
+    def ranked_providers(self):
+        with self.lock:
+            order = {provider.name: index for index, provider in enumerate(self.providers)}
+            return sorted(self.providers, key=lambda p: (self.stats[p.name].cost(), order[p.name]))
+
+    def run_provider(self, provider, query, num_results, timeout):
+        started = time.perf_counter()
+        failed = True
+        try:
+            urls = provider.search(query, num_results, timeout)
+            failed = not urls
+            return urls
+        finally:
+            duration = time.perf_counter() - started
+            with self.lock:
+                self.stats[provider.name].update(duration, failed)
+            metrics.record(f"search_{provider.name}", duration, failed)
+
+    def start_provider(self, provider, query, num_results, timeout):
+        """Run one provider on its own thread, so concurrent searches never queue behind each other"""
+        future = Future()
+
+        @metrics.propagate
+        def run():
+            future.set_running_or_notify_cancel()
+            try:
+                future.set_result(self.run_provider(provider, query, num_results, timeout))
+            except Exception as e:
+                future.set_exception(e)
+
+        thread = threading.Thread(target=run, name=f"search-{provider.name}")
+        thread.daemon = True
+        thread.start()
+        return future
+
+    def search(self, query, num_results=None, timeout=None):
+        """Return result URLs from the first provider that produces any"""
+        num_results = num_results or MobileConfig.MAX_SEARCH_RESULTS
+        timeout = timeout or MobileConfig.SEARCH_TIMEOUT
+        deadline = time.monotonic() + timeout
+        pending = self.ranked_providers()
+        running = {}
+        errors = []
+
+        def launch():
+            provider = pending.pop(0)
+            future = self.start_provider(provider, query, num_results, timeout)
+            running[future] = provider
+
+        launch()
+        while running:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            wait_time = min(MobileConfig.SEARCH_HEDGE_DELAY, remaining) if pending else remaining
+            done, _ = wait(running, timeout=wait_time, return_when=FIRST_COMPLETED)
+
+            if not done:
+                # Slow provider: hedge with the next one
+                if pending:
+                    app_logger.info(f"Search hedging with {pending[0].name}")
+                    launch()
+                continue
+
+            for future in done:
+                provider = running.pop(future)
+                try:
+                    urls = future.result()
+                except Exception as e:
+                    errors.append(f"{provider.name}: {str(e)}")
+                    app_logger.warning(f"Search provider {provider.name} failed: {str(e)}")
+                    continue
+                if urls:
+                    # Slower providers finish in the background and only update stats
+                    app_logger.info(f"Search answered by {provider.name}")
+                    return urls
+                errors.append(f"{provider.name}: no results")
+
+            if not running and pending:
+                launch()
+
+        if running:
+            errors.append("timed out")
+        raise RuntimeError("All search providers failed: " + "; ".join(errors))
+
+    def snapshot(self):
+        """Per-provider smoothed latency and error rate"""
+        with self.lock:
+            return {
+                name: {"latency_s": stats.latency, "error_rate": stats.error_rate, "calls": stats.calls}
+                for name, stats in self.stats.items()
+            }
@@ -1,136 +1,61 @@
 # text_processor.py
-import requests
-import base64
-import json
-import re
 from utils.logger import app_logger
 from utils.config import MobileConfig
+from ocr_backends import create_ocr_backend
+from image_preprocessor import ImagePreprocessor
+from mcq_parser import MCQParser
+from frame_buffer import Frame
+from frame_filters import SimilarFrames
+from utils.metrics import metrics
+from utils.single_flight import SingleFlight
 
 class TextProcessor:
-    def __init__(self):
-        self.mcq_pattern = r'([A-D])[\.\s\)]+\s*(.+?)(?=\s*(?:[A-D][\.\s\)]|$))'
-        self.api_key = MobileConfig.OCR_SPACE_API_KEY
-        self.api_url = "https://api.ocr.space/parse/image"
+    def __init__(self, ocr_backend=None):
+        self.parser = MCQParser()
+        self.ocr_backend = ocr_backend or create_ocr_backend()
+        self.preprocessor = ImagePreprocessor()
+        # Manual taps and auto-capture ticks of the same page share one OCR call
+        self.ocr_flights = SingleFlight(linger=MobileConfig.OCR_DEDUP_LINGER)
+        self.ocr_frames = SimilarFrames()
+        app_logger.info(f"Using OCR backend: {self.ocr_backend.name}")
         
     def extract_text(self, image_data):
-        """Extract text from image using OCR.Space API"""
+        """Extract text from image using the configured OCR backend"""
         try:
-            # Convert image to base64
-            if hasattr(image_data, 'read'):  # File object
-                encoded_image = base64.b64encode(image_data.read()).decode()
-            else:  # Assume it's image bytes
-                encoded_image = base64.b64encode(image_data).decode()
-            
-            payload = {
-                'apikey': self.api_key,
-                'base64Image': f"data:image/jpeg;base64,{encoded_image}",
-                'language': 'eng',
-                'isOverlayRequired': False,
-                'OCREngine': 2  # Engine 2 is more accurate
-            }
-            
-            response = requests.post(self.api_url, data=payload, timeout=30)
-            result = response.json()
-            
-            if result.get('IsErroredOnProcessing'):
-                error_msg = result.get('ErrorMessage', 'Unknown OCR error')
-                app_logger.error(f"OCR API error: {error_msg}")
-                return "", 0.0
-            
-            # Extract text and confidence
-            parsed_results = result.get('ParsedResults', [])
-            if parsed_results:
-                text = parsed_results[0].get('ParsedText', '')
-                confidence = float(parsed_results[0].get('TextOverlay', {}).get('MedianConfidence', 50))
-                app_logger.info(f"OCR extracted text with confidence: {confidence}")
-                return text, confidence / 100.0  # Convert to 0-1 scale
-            
-            return "", 0.0
-            
+            key = self.ocr_frames.key(image_data, self.ocr_flights.keys())
+            if key is None:
+                return self.run_ocr(image_data)
+            return self.ocr_flights.do(key, self.run_ocr, image_data)
         except Exception as e:
             app_logger.error(f"OCR extraction error: {str(e)}")
             return "", 0.0
     
+    def run_ocr(self, image_data):
+        if isinstance(image_data, Frame) and MobileConfig.PREPROCESS_IMAGES:
+            with metrics.span("preprocess"):
+                image_data = self.preprocessor.process(image_data)
+        return self.ocr_backend.extract_text(image_data)
+    
     def parse_mcq(self, text):
-        """Parse MCQ question and options from text - IMPROVED VERSION"""
-        # First clean the text
-        text = self.clean_text(text)
-        
-        # Split into lines for processing
-        lines = text.split('\n')
-        question_lines = []
-        options = {}
-        current_option = None
-        option_text = []
-        found_first_option = False
-        
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-                
-            # Check if this line starts an option (A), B), etc.)
-            option_match = re.match(r'^([A-D])[\.\s\)]\s*(.*)', line, re.IGNORECASE)
-            if option_match:
-                found_first_option = True
-                
-                # If we were collecting an option, save it
-                if current_option and option_text:
-                    options[current_option] = ' '.join(option_text).strip()
-                
-                # Start new option
-                current_option = option_match.group(1).upper()
-                option_text = [option_match.group(2).strip()]
-                
-            elif current_option:
-                # Continue collecting current option text
-                option_text.append(line)
-            elif not found_first_option:
-                # This line is part of the question (before any options)
-                question_lines.append(line)
-        
-        # Save the last option if we were collecting one
-        if current_option and option_text:
-            options[current_option] = ' '.join(option_text).strip()
-        
-        # Join question lines and clean
-        question = ' '.join(question_lines).strip()
-        question = self.clean_question(question)
-        
-        # Debug logs
-        app_logger.info(f"Extracted question: '{question}'")
-        app_logger.info(f"Question length: {len(question)}")
-        app_logger.info(f"Extracted options: {options}")
-        app_logger.info(f"Number of options: {len(options)}")
-        
-        return question, options
+        """Parse MCQ question and options from text"""
+        return self.parser.parse_mcq(text)
+    
+    def parse_questions(self, text):
+        """Parse every valid MCQ on a page, keyed by question number"""
+        questions = [
+            item for item in self.parser.parse(text)
+            if self.is_valid_question(item["question"], item["options"])
+        ]
+        app_logger.info(f"Parsed {len(questions)} valid question(s) from OCR text")
+        return questions
     
     def clean_question(self, question):
         """Remove common header patterns from question"""
-        # Remove patterns like "1)", "Title", etc.
-        patterns = [
-            r'^\s*\d+[\.\)]\s*',
-            r'^\s*Title\s*',
-            r'^\s*Question\s*\d*\s*',
-            r'^\s*MCQ\s*\d*\s*',
-            r'^\s*[Qq]\s*\d*[\.\)\:\-]\s*'
-        ]
-        
-        for pattern in patterns:
-            cleaned = re.sub(pattern, '', question, flags=re.IGNORECASE)
-            # Only update if we actually removed something and result is not empty
-            if cleaned.strip() and cleaned != question:
-                question = cleaned
-        
-        return question.strip()
+        return self.parser.clean_question(question)
     
     def clean_text(self, text):
         """Clean OCR text"""
-        # Remove extra whitespace but preserve newlines for line-by-line processing
-        text = re.sub(r'[ \t]+', ' ', text)
-        # Fix common OCR mistakes
-        text = text.replace('|', 'I').replace('0', 'O')
-        return text.strip()
+        return self.parser.clean_text(text)
     
     def is_valid_question(self, question, options):
         """Check if we have a valid MCQ"""
@@ -139,5 +64,5 @@ class TextProcessor:
         # Check if we have at least 2 options
         valid_options = len(options) >= 2
         
-        app_logger.info(f"Question validation - Meaningful: {meaningful_question}, Options: {valid_options}")
+        app_logger.debug("Question validation - Meaningful: %s, Options: %s", meaningful_question, valid_options)
         return meaningful_question and valid_options
\ No newline at end of file
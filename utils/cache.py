@@ -0,0 +1,183 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from utils.logger import app_logger
+from utils.config import MobileConfig
+
+class AnswerCache:
+    """SQLite-backed answer cache with TTL expiry and LRU eviction"""
+
+    def __init__(self, db_path=None, ttl=None, max_entries=None):
+        self.db_path = db_path or MobileConfig.CACHE_DB_PATH
+        self.ttl = MobileConfig.CACHE_DURATION if ttl is None else ttl
+        self.max_entries = max_entries or MobileConfig.CACHE_MAX_ENTRIES
+        self.lock = threading.Lock()
+        # Hot entries are served from memory without touching the database
+        self.memory = OrderedDict()
+
+        cache_dir = os.path.dirname(self.db_path)
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS answers ("
+            "key TEXT PRIMARY KEY, "
+            "value TEXT NOT NULL, "
+            "created REAL NOT NULL, "
+            "accessed REAL NOT NULL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS answers_accessed ON answers (accessed)")
+        self.conn.commit()
+
+        app_logger.info(f"Answer cache opened at {self.db_path}")
+
+    @staticmethod
+    def normalize(text):
+        """Lowercase and collapse everything but letters and digits"""
+        return ' '.join(re.findall(r'[a-z0-9]+', text.lower()))
+
+    @staticmethod
+    def fingerprint(question, options):
+        """Build a stable key from the question and its options"""
+        parts = [AnswerCache.normalize(question)]
+        for option in sorted(options.keys()):
+            parts.append(f"{option.upper()}={AnswerCache.normalize(options[option])}")
+        return hashlib.sha1('\n'.join(parts).encode('utf-8')).hexdigest()
+
+    def get(self, question, options):
+        """Return cached answers or None if missing or expired"""
+        key = self.fingerprint(question, options)
+        now = time.time()
+
+        with self.lock:
+            entry = self.memory.get(key)
+            if entry is not None:
+                created, answers = entry
+                if now - created <= self.ttl:
+                    self.memory.move_to_end(key)
+                    return answers
+                del self.memory[key]
+
+            row = self.conn.execute(
+                "SELECT value, created FROM answers WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            value, created = row
+            if now - created > self.ttl:
+                self.conn.execute("DELETE FROM answers WHERE key = ?", (key,))
+                self.conn.commit()
+                return None
+
+            self.conn.execute("UPDATE answers SET accessed = ? WHERE key = ?", (now, key))
+            self.conn.commit()
+
+            answers = json.loads(value)
+            self.remember(key, created, answers)
+
+        return answers
+
+    def put(self, question, options, answers):
+        """Store answers and evict least recently used entries"""
+        key = self.fingerprint(question, options)
+        now = time.time()
+
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO answers (key, value, created, accessed) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(answers), now, now)
+            )
+            self.conn.execute("DELETE FROM answers WHERE created < ?", (now - self.ttl,))
+            self.conn.execute(
+                "DELETE FROM answers WHERE key IN ("
+                "SELECT key FROM answers ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+            self.conn.commit()
+            self.remember(key, now, answers)
+
+    def remember(self, key, created, answers):
+        """Keep an entry in the in-memory LRU layer"""
+        self.memory[key] = (created, answers)
+        self.memory.move_to_end(key)
+        while len(self.memory) > MobileConfig.CACHE_MEMORY_ENTRIES:
+            self.memory.popitem(last=False)
+
+    def clear(self):
+        """Remove all cached answers"""
+        with self.lock:
+            self.memory.clear()
+            self.conn.execute("DELETE FROM answers")
+            self.conn.commit()
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+class PageCache:
+    """SQLite store of scraped pages with their ETag/Last-Modified validators"""
+
+    def __init__(self, db_path=None, max_entries=None):
+        self.db_path = db_path or MobileConfig.PAGE_CACHE_DB_PATH
+        self.max_entries = max_entries or MobileConfig.PAGE_CACHE_MAX_ENTRIES
+        self.lock = threading.Lock()
+
+        cache_dir = os.path.dirname(self.db_path)
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS pages ("
+            "url TEXT PRIMARY KEY, "
+            "etag TEXT, "
+            "last_modified TEXT, "
+            "charset TEXT NOT NULL, "
+            "body BLOB NOT NULL, "
+            "accessed REAL NOT NULL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS pages_accessed ON pages (accessed)")
+        self.conn.commit()
+
+    def get(self, url):
+        """Return the cached page as a dict or None"""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT etag, last_modified, charset, body FROM pages WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        etag, last_modified, charset, body = row
+        return {"etag": etag, "last_modified": last_modified, "charset": charset, "body": body}
+
+    def touch(self, url):
+        """Mark a page as recently used after a 304 revalidation"""
+        with self.lock:
+            self.conn.execute("UPDATE pages SET accessed = ? WHERE url = ?", (time.time(), url))
+            self.conn.commit()
+
+    def put(self, url, etag, last_modified, charset, body):
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO pages (url, etag, last_modified, charset, body, accessed) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (url, etag, last_modified, charset, sqlite3.Binary(body), time.time())
+            )
+            self.conn.execute(
+                "DELETE FROM pages WHERE url IN ("
+                "SELECT url FROM pages ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+            self.conn.commit()
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
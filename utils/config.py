@@ -9,15 +9,75 @@ class MobileConfig:
     OCR_CONFIDENCE_THRESHOLD = 0.5
     TEXT_MIN_LENGTH = 20
     
+    # OCR backend: "ocr_space" (web API) or "local" (on-device EasyOCR)
+    OCR_BACKEND = "ocr_space"
+    LOCAL_OCR_LANGUAGES = ['en']
+    
+    # Image preprocessing before OCR
+    PREPROCESS_IMAGES = True
+    PREPROCESS_MAX_WIDTH = 1280  # Frames wider than this are downscaled
+    PREPROCESS_BLOCK_SIZE = 31  # Adaptive threshold neighbourhood (odd)
+    PREPROCESS_THRESHOLD_OFFSET = 15  # Subtracted from the local mean
+    PREPROCESS_MIN_SKEW = 0.5  # Degrees; smaller skew is left alone
+    PREPROCESS_MAX_SKEW = 15  # Degrees; larger angles are not text skew
+    PREPROCESS_MARGIN = 10  # Pixels kept around the detected text
+    
+    # Frame quality gate before OCR
+    QUALITY_GATE = True  # Reject blurry, badly exposed or text-free frames before OCR
+    QUALITY_WIDTH = 320  # Frames are downscaled to this width for the checks
+    QUALITY_MIN_SHARPNESS = 30.0  # Laplacian variance below this is too blurry
+    QUALITY_MIN_BRIGHTNESS = 40  # Mean grey level, 0-255
+    QUALITY_MAX_BRIGHTNESS = 220  # Brighter frames without edges are reported as overexposed
+    QUALITY_MIN_EDGE_DENSITY = 0.003  # Fraction of edge pixels; fewer means no text in view
+    QUALITY_MAX_EDGE_DENSITY = 0.35  # More is texture or noise rather than printed text
+    
     # Capture modes
-    AUTO_CAPTURE_INTERVAL = 2.0  # Seconds between auto-captures
+    AUTO_CAPTURE_INTERVAL = 2.0  # Longest pause between auto-capture polls when the page is unchanged
+    AUTO_CAPTURE_POLL_INTERVAL = 0.25  # Seconds between stability checks in auto mode
+    AUTO_STABLE_THRESHOLD = 0.02  # Mean pixel motion (0-1) between polls that still counts as steady
+    AUTO_STABLE_POLLS = 2  # Consecutive steady polls before a frame is scanned
+    AUTO_LATENCY_ALPHA = 0.3  # Weight of the newest scan in the pipeline latency average
     MANUAL_MODE = "manual"
     AUTO_MODE = "auto"
     
     # Search settings
     MAX_SEARCH_RESULTS = 3
     SEARCH_TIMEOUT = 15
+    SEARCH_PROVIDERS = ["google", "duckduckgo"]  # Fallback order before latency stats exist
+    SEARCH_HEDGE_DELAY = 2.0  # Seconds before a slow provider is raced by the next one
+    SEARCH_STATS_ALPHA = 0.3  # Weight of the newest call in provider latency and error rates
+    SEARCH_ERROR_PENALTY = 4  # How strongly errors push a provider down the ranking
     CACHE_DURATION = 300  # Cache results for 5 minutes
+    CACHE_DB_PATH = "cache/answers.db"
+    CACHE_MAX_ENTRIES = 500  # Least recently used answers are evicted beyond this
+    CACHE_MEMORY_ENTRIES = 50  # Hot answers kept in memory in front of SQLite
+    PAGE_FETCH_TIMEOUT = 10  # Seconds per result page
+    PAGE_MAX_BYTES = 512 * 1024  # Stop reading a result page after this many bytes
+    PAGE_CHUNK_SIZE = 16 * 1024
+    PAGE_CACHE_DB_PATH = "cache/pages.db"
+    PAGE_CACHE_MAX_ENTRIES = 200  # Pages kept for conditional GETs
+    
+    # HTTP client
+    HTTP_USER_AGENT = 'Mozilla/5.0 (Linux; Android 10; Mobile) AppleWebKit/537.36'
+    HTTP_POOL_CONNECTIONS = 10  # Hosts with a kept-alive pool
+    HTTP_POOL_MAXSIZE = 8  # Connections kept per host
+    HTTP_RETRIES = 2
+    HTTP_BACKOFF_FACTOR = 0.3  # Seconds; doubles on each retry
+    MAX_FETCH_WORKERS = 4  # Result pages fetched in parallel
+    EARLY_STOP_MIN_VOTES = 3  # Votes the leading option needs before stopping early
+    EARLY_STOP_RATIO = 0.7  # Share of all votes the leading option needs to stop early
+    MAX_PARALLEL_QUESTIONS = 4  # Questions from one page searched at the same time
+    ANSWER_WINDOW_BEFORE = 200  # Characters before the question searched for answers
+    ANSWER_WINDOW_AFTER = 1500  # Characters after the question searched for answers
+    OPTION_MATCH_THRESHOLD = 0.7  # Fuzzy option text similarity that counts as a match
+    
+    # Local question bank
+    QUESTION_BANK_PATH = "cache/question_bank.db"
+    QUESTION_BANK_MIN_SIMILARITY = 0.9  # Trigram Jaccard score needed to trust a match; only OCR noise is tolerated
+    QUESTION_BANK_OPTION_SIMILARITY = 0.8  # Every stored option must match a scanned one this closely
+    QUESTION_BANK_WEB_TTL = 7 * 24 * 3600  # Seconds a confirmed web answer is served offline
+    QUESTION_BANK_CANDIDATES = 10  # Index hits scored per lookup
+    QUESTION_BANK_MMAP_BYTES = 64 * 1024 * 1024
     
     # UI settings
     FONT_SIZE_SMALL = 14
@@ -26,4 +86,19 @@ class MobileConfig:
     
     # Performance
     MAX_QUEUE_SIZE = 5
-    FRAME_SKIP_COUNT = 3  # Process every 3rd frame
\ No newline at end of file
+    PROCESSING_WORKERS = 2  # Persistent pipeline worker threads
+    BATCH_OCR_WORKERS = None  # OCR processes in batch mode; None uses every core
+    BATCH_SEARCH_WORKERS = 8  # Concurrent answer searches in batch mode
+    METRICS_WINDOW = 500  # Recent samples per stage used for percentiles
+    METRICS_PORT = None  # Set to a port to serve /metrics on localhost
+    FRAME_SKIP_COUNT = 3  # Process every 3rd frame
+    FRAME_THUMB_WIDTH = 64  # Width of the thumbnail used for frame comparison
+    FRAME_CHANGE_THRESHOLD = 0.04  # Mean pixel difference (0-1) that counts as a new frame
+    OCR_DEDUP_LINGER = 2.0  # Seconds an OCR result is reused for an identical frame
+    
+    # Scan journal
+    JOURNAL_PATH = "logs/scans.jsonl"
+    JOURNAL_MAX_BYTES = 5 * 1024 * 1024  # Rotate after 5 MB
+    JOURNAL_BACKUP_COUNT = 3
+    JOURNAL_FLUSH_EVERY = 10  # Records buffered before a write
+    JOURNAL_FLUSH_INTERVAL = 5.0  # Seconds before buffered records are written anyway
\ No newline at end of file
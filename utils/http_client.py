@@ -0,0 +1,165 @@
+import codecs
+import re
+import threading
+from contextlib import contextmanager
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from utils.logger import app_logger
+from utils.config import MobileConfig
+from utils.cache import PageCache
+
+def accept_encoding():
+    """Advertise brotli only when urllib3 can decode it"""
+    try:
+        import brotli  # noqa: F401
+        return 'gzip, deflate, br'
+    except ImportError:
+        try:
+            import brotlicffi  # noqa: F401
+            return 'gzip, deflate, br'
+        except ImportError:
+            return 'gzip, deflate'
+
+
+def create_session():
+    """Session with a tuned keep-alive pool and bounded retries"""
+    retries = Retry(
+        total=MobileConfig.HTTP_RETRIES,
+        backoff_factor=MobileConfig.HTTP_BACKOFF_FACTOR,
+        status_forcelist=(429, 500, 502, 503, 504),
+        # POSTs are only retried on connection errors, never after a response
+        allowed_methods=frozenset(['GET', 'HEAD']),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=MobileConfig.HTTP_POOL_CONNECTIONS,
+        pool_maxsize=MobileConfig.HTTP_POOL_MAXSIZE,
+        max_retries=retries,
+    )
+
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update({
+        'User-Agent': MobileConfig.HTTP_USER_AGENT,
+        'Accept-Encoding': accept_encoding(),
+    })
+    return session
+
+
+def response_charset(response):
+    """Charset declared in the Content-Type header, defaulting to UTF-8"""
+    match = re.search(r'charset=["\']?([\w\-]+)', response.headers.get('Content-Type', ''), re.IGNORECASE)
+    if match:
+        try:
+            codecs.lookup(match.group(1))
+            return match.group(1)
+        except LookupError:
+            pass
+    return 'utf-8'
+
+
+class HttpClient:
+    """Shared HTTP client: pooled session plus conditional GETs for scraped pages"""
+
+    def __init__(self, page_cache=None):
+        self.session = create_session()
+        self.page_cache = page_cache
+
+    def post(self, url, **kwargs):
+        return self.session.post(url, **kwargs)
+
+    def get(self, url, **kwargs):
+        return self.session.get(url, **kwargs)
+
+    @contextmanager
+    def stream_page(self, url, timeout=None, cancel=None):
+        """Yield (chunk iterator, charset) for a page, revalidating cached copies.
+
+        Pages whose cancel event is set by the time the reader stops are not
+        downloaded any further.
+        """
+        cached = self.page_cache.get(url) if self.page_cache else None
+        headers = {}
+        if cached:
+            if cached["etag"]:
+                headers['If-None-Match'] = cached["etag"]
+            if cached["last_modified"]:
+                headers['If-Modified-Since'] = cached["last_modified"]
+
+        response = self.session.get(url, timeout=timeout, stream=True, headers=headers)
+        try:
+            if response.status_code == 304 and cached:
+                app_logger.info(f"Page not modified, using cached copy: {url}")
+                self.page_cache.touch(url)
+                yield iter([bytes(cached["body"])]), cached["charset"]
+                return
+
+            charset = response_charset(response)
+            chunks = response.iter_content(chunk_size=MobileConfig.PAGE_CHUNK_SIZE)
+            if not self.cacheable(response):
+                yield chunks, charset
+                return
+
+            recorder = self.recording(
+                chunks, url, response.headers.get('ETag'), response.headers.get('Last-Modified'), charset
+            )
+            yield recorder, charset
+            if recorder.gi_frame is not None and not (cancel is not None and cancel.is_set()):
+                # The reader stopped early; finish the download in the background so the
+                # cached copy is the whole page without holding up the reader
+                threading.Thread(
+                    target=self.finish_recording, args=(recorder, response), name="page-cache", daemon=True
+                ).start()
+                response = None
+        finally:
+            if response is not None:
+                response.close()
+
+    def cacheable(self, response):
+        """True for full responses with validators that fit within PAGE_MAX_BYTES"""
+        if not self.page_cache or response.status_code != 200:
+            return False
+        if not (response.headers.get('ETag') or response.headers.get('Last-Modified')):
+            return False
+        length = response.headers.get('Content-Length', '')
+        return not (length.isdigit() and int(length) > MobileConfig.PAGE_MAX_BYTES)
+
+    def recording(self, chunks, url, etag, last_modified, charset):
+        """Pass chunks through and store the page once it was read completely"""
+        body = bytearray()
+        for chunk in chunks:
+            body.extend(chunk)
+            if len(body) > MobileConfig.PAGE_MAX_BYTES:
+                # Too large to cache; readers stop at the same limit
+                yield chunk
+                return
+            yield chunk
+
+        # Only complete pages are cached; a 304 must be able to stand in for the full body
+        self.page_cache.put(url, etag, last_modified, charset, bytes(body))
+
+    def finish_recording(self, recorder, response):
+        """Read the rest of a page the reader abandoned so it can be cached"""
+        try:
+            for _ in recorder:
+                pass
+        except Exception as e:
+            app_logger.debug(f"Page not cached, download failed: {e}")
+        finally:
+            response.close()
+
+
+_client = None
+_client_lock = threading.Lock()
+
+def get_http_client():
+    """Return the process-wide HTTP client"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = HttpClient(page_cache=PageCache())
+    return _client
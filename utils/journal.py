@@ -0,0 +1,102 @@
+import atexit
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from utils.logger import app_logger
+from utils.config import MobileConfig
+
+class ScanJournal:
+    """Append-only JSON Lines record of every scan, buffered and size-rotated"""
+
+    def __init__(self, path=None, max_bytes=None, backup_count=None):
+        self.path = path or MobileConfig.JOURNAL_PATH
+        self.max_bytes = max_bytes or MobileConfig.JOURNAL_MAX_BYTES
+        self.backup_count = MobileConfig.JOURNAL_BACKUP_COUNT if backup_count is None else backup_count
+        self.lock = threading.Lock()
+        self.buffer = []
+        self.last_flush = time.monotonic()
+
+        journal_dir = os.path.dirname(self.path)
+        if journal_dir:
+            os.makedirs(journal_dir, exist_ok=True)
+        self.file = open(self.path, "a", encoding="utf-8")
+        atexit.register(self.close)
+
+    def record(self, **fields):
+        """Queue one scan record; it is written on the next batch flush"""
+        entry = {"timestamp": datetime.now().isoformat(timespec="milliseconds")}
+        entry.update(fields)
+        line = json.dumps(entry, ensure_ascii=False, default=str)
+
+        with self.lock:
+            self.buffer.append(line)
+            if (len(self.buffer) >= MobileConfig.JOURNAL_FLUSH_EVERY or
+                    time.monotonic() - self.last_flush >= MobileConfig.JOURNAL_FLUSH_INTERVAL):
+                self._flush()
+
+    def flush(self):
+        with self.lock:
+            self._flush()
+
+    def _flush(self):
+        if self.file is None or not self.buffer:
+            return
+        try:
+            self.file.write("\n".join(self.buffer) + "\n")
+            self.file.flush()
+            self.buffer = []
+            self.last_flush = time.monotonic()
+
+            if self.file.tell() >= self.max_bytes:
+                self._rotate()
+        except Exception as e:
+            app_logger.error(f"Failed to write scan journal: {str(e)}")
+
+    def _rotate(self):
+        """Shift journal.jsonl -> journal.jsonl.1 -> ... and start a new file"""
+        self.file.close()
+        if self.backup_count > 0:
+            for index in range(self.backup_count - 1, 0, -1):
+                source = f"{self.path}.{index}"
+                if os.path.exists(source):
+                    os.replace(source, f"{self.path}.{index + 1}")
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        self.file = open(self.path, "a", encoding="utf-8")
+        app_logger.info(f"Scan journal rotated at {self.path}")
+
+    def close(self):
+        with self.lock:
+            self._flush()
+            if self.file is not None:
+                self.file.close()
+                self.file = None
+
+
+def read_journal(path=None, include_rotated=True):
+    """Yield scan records oldest first, including rotated files"""
+    path = path or MobileConfig.JOURNAL_PATH
+    paths = []
+    if include_rotated:
+        index = 1
+        while os.path.exists(f"{path}.{index}"):
+            paths.append(f"{path}.{index}")
+            index += 1
+        paths.reverse()
+    if os.path.exists(path):
+        paths.append(path)
+
+    for journal_path in paths:
+        with open(journal_path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    # A crash can leave a truncated last line
+                    app_logger.warning(f"Skipping malformed journal line in {journal_path}")
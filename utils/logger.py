@@ -1,59 +1,82 @@
-# utils/logger.py
+import atexit
 import logging
+import logging.handlers
 import os
+import queue
+import threading
 from datetime import datetime
-import inspect
 
 class MobileLogger:
     def __init__(self, app_name="MCQScanner"):
         self.app_name = app_name
-        self.setup_logging()
-    
+        # Handlers, log directory and listener thread are created on first use,
+        # so importing this module stays free of filesystem access
+        self._logger = None
+        self._setup_lock = threading.Lock()
+
+    @property
+    def logger(self):
+        if self._logger is None:
+            with self._setup_lock:
+                if self._logger is None:
+                    self.setup_logging()
+        return self._logger
+
+    def set_level(self, level):
+        """Set the level without setting up handlers, so it also covers the startup banner"""
+        logging.getLogger(self.app_name).setLevel(level)
+
     def setup_logging(self):
         # Create logs directory
         if not os.path.exists('logs'):
             os.makedirs('logs')
-        
+
         # Log file with timestamp
         log_filename = f"logs/{self.app_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
-        
+
+        # Caller info comes from the log record itself instead of walking the stack
+        formatter = logging.Formatter(
+            '%(asctime)s - [%(levelname)s] - %(name)s - '
+            '[%(filename)s:%(funcName)s():%(lineno)d] %(message)s'
+        )
+        file_handler = logging.FileHandler(log_filename, delay=True)
+        file_handler.setFormatter(formatter)
+        console_handler = logging.StreamHandler()  # Also print to console
+        console_handler.setFormatter(formatter)
+
+        # Callers only enqueue records; a listener thread does the file and console I/O
+        log_queue = queue.SimpleQueue()
+        self.listener = logging.handlers.QueueListener(
+            log_queue, file_handler, console_handler, respect_handler_level=True
+        )
+        self.listener.start()
+        atexit.register(self.listener.stop)
+
+        queue_handler = logging.handlers.QueueHandler(log_queue)
+        # Only merge the arguments here; the listener's handlers apply the real format
+        queue_handler.setFormatter(logging.Formatter('%(message)s'))
+
         logging.basicConfig(
             level=logging.INFO,
-            format='%(asctime)s - [%(levelname)s] - %(name)s - %(message)s',
-            handlers=[
-                logging.FileHandler(log_filename),
-                logging.StreamHandler()  # Also print to console
-            ]
+            handlers=[queue_handler]
         )
-        
-        self.logger = logging.getLogger(self.app_name)
-        self.logger.info("=== MCQ Mobile Scanner Started ===")
-    
-    def get_caller_info(self):
-        """Get file and function name of caller"""
-        stack = inspect.stack()
-        # Skip current frame, get caller's frame
-        caller_frame = stack[2]
-        filename = os.path.basename(caller_frame.filename)
-        function = caller_frame.function
-        line_no = caller_frame.lineno
-        return f"{filename}:{function}():{line_no}"
-    
-    def info(self, message):
-        caller = self.get_caller_info()
-        self.logger.info(f"[{caller}] {message}")
-    
-    def error(self, message):
-        caller = self.get_caller_info()
-        self.logger.error(f"[{caller}] {message}")
-    
-    def warning(self, message):
-        caller = self.get_caller_info()
-        self.logger.warning(f"[{caller}] {message}")
-    
-    def debug(self, message):
-        caller = self.get_caller_info()
-        self.logger.debug(f"[{caller}] {message}")
+
+        self._logger = logging.getLogger(self.app_name)
+        self._logger.info("=== MCQ Mobile Scanner Started ===")
+
+    # stacklevel=2 attributes each record to the caller of these wrappers.
+    # Pass format arguments separately so disabled levels skip formatting.
+    def info(self, message, *args):
+        self.logger.info(message, *args, stacklevel=2)
+
+    def error(self, message, *args):
+        self.logger.error(message, *args, stacklevel=2)
+
+    def warning(self, message, *args):
+        self.logger.warning(message, *args, stacklevel=2)
+
+    def debug(self, message, *args):
+        self.logger.debug(message, *args, stacklevel=2)
 
 # Global logger instance
-app_logger = MobileLogger()
\ No newline at end of file
+app_logger = MobileLogger()
@@ -0,0 +1,188 @@
+import math
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from utils.logger import app_logger
+from utils.config import MobileConfig
+
+class StageStats:
+    """Running totals plus a window of recent samples for one stage"""
+
+    def __init__(self, window):
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.samples = deque(maxlen=window)
+
+    def add(self, duration, failed=False):
+        self.count += 1
+        self.total += duration
+        self.max = max(self.max, duration)
+        self.samples.append(duration)
+        if failed:
+            self.errors += 1
+
+    def summary(self):
+        ordered = sorted(self.samples)
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "mean_ms": (self.total / self.count) * 1000 if self.count else 0.0,
+            "p50_ms": percentile(ordered, 50) * 1000,
+            "p95_ms": percentile(ordered, 95) * 1000,
+            "p99_ms": percentile(ordered, 99) * 1000,
+            "max_ms": self.max * 1000,
+        }
+
+
+def percentile(ordered, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not ordered:
+        return 0.0
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct * len(ordered) / 100) - 1))
+    return ordered[rank]
+
+
+class Timings(dict):
+    """Span durations in ms collected for one piece of work"""
+
+    def __init__(self):
+        super().__init__()
+        self.open = True
+
+
+class Metrics:
+    """Per-stage latency spans aggregated into percentiles"""
+
+    def __init__(self, window=None):
+        self.window = window or MobileConfig.METRICS_WINDOW
+        self.stages = {}
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.server = None
+
+    @contextmanager
+    def span(self, name):
+        """Time a block and record it under the given stage name"""
+        start = time.perf_counter()
+        failed = False
+        try:
+            yield
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            self.record(name, time.perf_counter() - start, failed)
+
+    @contextmanager
+    def collect(self, timings=None):
+        """Also collect this thread's span durations into a dict, in ms.
+
+        Passing the dict of another thread's collect() adds spans run on
+        its behalf; they are dropped once that collect() has ended.
+        """
+        owner = timings is None
+        if owner:
+            timings = Timings()
+        previous = getattr(self.local, "timings", None)
+        self.local.timings = timings
+        try:
+            yield timings
+        finally:
+            self.local.timings = previous
+            if owner:
+                with self.lock:
+                    timings.open = False
+
+    def propagate(self, func):
+        """Wrap func so spans it records on a pool thread reach this thread's collect()"""
+        timings = getattr(self.local, "timings", None)
+        if timings is None:
+            return func
+
+        def run(*args, **kwargs):
+            with self.collect(timings):
+                return func(*args, **kwargs)
+        return run
+
+    def record(self, name, duration, failed=False):
+        with self.lock:
+            stats = self.stages.get(name)
+            if stats is None:
+                stats = self.stages[name] = StageStats(self.window)
+            stats.add(duration, failed)
+
+            timings = getattr(self.local, "timings", None)
+            if timings is not None and timings.open:
+                timings[name] = round(timings.get(name, 0.0) + duration * 1000, 3)
+
+    def snapshot(self):
+        """Return {stage: summary} for every recorded stage"""
+        with self.lock:
+            return {name: stats.summary() for name, stats in self.stages.items()}
+
+    def reset(self):
+        with self.lock:
+            self.stages.clear()
+
+    def prometheus_text(self):
+        """Render the snapshot in the Prometheus text exposition format"""
+        lines = [
+            "# HELP mcq_stage_latency_seconds Scan pipeline stage latency",
+            "# TYPE mcq_stage_latency_seconds summary",
+        ]
+        with self.lock:
+            for name, stats in sorted(self.stages.items()):
+                ordered = sorted(stats.samples)
+                for quantile in (50, 95, 99):
+                    lines.append(
+                        f'mcq_stage_latency_seconds{{stage="{name}",quantile="{quantile / 100}"}} '
+                        f'{percentile(ordered, quantile):.6f}'
+                    )
+                lines.append(f'mcq_stage_latency_seconds_sum{{stage="{name}"}} {stats.total:.6f}')
+                lines.append(f'mcq_stage_latency_seconds_count{{stage="{name}"}} {stats.count}')
+                lines.append(f'mcq_stage_errors_total{{stage="{name}"}} {stats.errors}')
+        return "\n".join(lines) + "\n"
+
+    def start_server(self, port=None, host="127.0.0.1"):
+        """Serve /metrics on a local port from a background thread"""
+        if self.server is not None:
+            return self.server
+
+        metrics = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path != "/metrics":
+                    self.send_error(404)
+                    return
+                body = metrics.prometheus_text().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        if port is None:
+            port = MobileConfig.METRICS_PORT
+        self.server = ThreadingHTTPServer((host, port), MetricsHandler)
+        thread = threading.Thread(target=self.server.serve_forever, name="metrics-server")
+        thread.daemon = True
+        thread.start()
+        app_logger.info(f"Metrics endpoint listening on http://{host}:{self.server.server_port}/metrics")
+        return self.server
+
+    def stop_server(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+# Global metrics registry
+metrics = Metrics()
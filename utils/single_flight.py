@@ -0,0 +1,79 @@
+import threading
+import time
+from concurrent.futures import Future
+
+class SingleFlight:
+    """Share one in-flight call between callers asking for the same key.
+
+    The first caller for a key becomes the leader and does the work;
+    everyone else arriving before it finishes waits on the same future.
+    With linger > 0 a successful result is also handed to callers that
+    arrive shortly after the leader finished.
+    """
+
+    def __init__(self, linger=0.0):
+        self.linger = linger
+        self.calls = {}
+        self.lock = threading.Lock()
+
+    def claim(self, key):
+        """Return (future, is_leader); the leader must call resolve()"""
+        with self.lock:
+            self.expire()
+            entry = self.calls.get(key)
+            if entry is not None:
+                return entry[0], False
+            future = Future()
+            self.calls[key] = (future, None)
+            return future, True
+
+    def resolve(self, key, future, result=None, error=None):
+        """Publish the leader's outcome to every waiting caller.
+
+        A None result means the leader gave up; waiters then retry on
+        their own.
+        """
+        with self.lock:
+            if self.calls.get(key, (None,))[0] is future:
+                if self.linger and error is None and result is not None:
+                    self.calls[key] = (future, time.monotonic() + self.linger)
+                else:
+                    del self.calls[key]
+
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def do(self, key, func, *args, **kwargs):
+        """Run func once per key among concurrent callers and share its result"""
+        while True:
+            future, leader = self.claim(key)
+            if not leader:
+                result = future.result()
+                if result is not None:
+                    return result
+                continue
+
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                self.resolve(key, future, error=e)
+                raise
+            except BaseException:
+                self.resolve(key, future)
+                raise
+            self.resolve(key, future, result)
+            return result
+
+    def keys(self):
+        """Keys with a call in flight or a result still lingering"""
+        with self.lock:
+            self.expire()
+            return set(self.calls)
+
+    def expire(self):
+        now = time.monotonic()
+        expired = [key for key, (_, expires) in self.calls.items() if expires is not None and expires <= now]
+        for key in expired:
+            del self.calls[key]